@@ -1,130 +1,332 @@
 import os.path
+import sys
+import traceback
 
-from svg.path import parse_path
-from xml.dom.minidom import parse
-import numpy as np
+from argparse import ArgumentParser
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from os import listdir
 from os.path import isfile, join
-import xml.etree.ElementTree as ET
+
+from svgoutline.svg_paths import read_paths
+from svgoutline.path_segments import parse_path_data
+from svgoutline.svg_tokenizer import parse_numbers
+from svgoutline.svg_utils import css_dimension_to_mm, MM_PER_INCH
+from svgoutline.transforms import IDENTITY, affine_matrix, translation_matrix, compose_transforms, apply_transform, max_scale
+from svgoutline.path_sampling import sample_segments, flatten_path
+from svgoutline.bounds import paths_bounds
+from svgoutline.stroke_order import order_strokes
+from svgoutline.stroke_history import StrokeHistoryWriter
+from svgoutline.iam_writer import IAMWriter
+from svgoutline.build_cache import BuildManifest, atomic_output, file_hash
+from svgoutline.version import __version__
 
 default_x = 400
 default_y = 200
 
 
-def get_first_pos(str):
-    path = parse_path(str)
-    point = path[0].point(0)
-    return point.real
-
-
-# root = ET.Element("root")
-# doc = ET.SubElement(root, "doc")
-#
-# ET.SubElement(doc, "field1", name="blah").text = "some value1"
-# ET.SubElement(doc, "field2", name="asdfasd").text = "some vlaue2"
-#
-# tree = ET.ElementTree(root)
-# tree.write("filename.xml")
-
-def bezier_to_points(svg_input, stroke_dir, xml_output, num_points):
-    # Parse the SVG XML file
-    dom = parse(svg_input)
-    path_strings = [path.getAttribute('d') for path in dom.getElementsByTagName('path')]
-    path_strings.sort(key=get_first_pos)
-    dom.unlink()
-
-    xmlroot = ET.Element("WhiteboardCaptureSession")
-    WhiteboardDescription = ET.SubElement(xmlroot, "WhiteboardDescription")
-    ET.SubElement(WhiteboardDescription, "SensorLocation", corner="top_left")
-
-    # Parse each path, convert Bézier curves to points, and create new path strings
-    max_x = 0
-    max_y = 0
-    min_x = 100000
-    min_y = 100000
-    new_path_strings = []
-    for path_string in path_strings:
-        path = parse_path(path_string)
-        # str_point = path[0].point(0)
-        # str_path = "M" + str(str_point.real) + " " + str(str_point.imag) + " "
-        points = []
-        # new_path_strings.append(str_path)
-        # for curve in path:
-        for i in range(0, len(path)):
-            curve = path[i]
-            for t in np.linspace(0, 1, 10):
-                point = curve.point(t)
-                points.append(point)
-                max_x = max(max_x, point.real)
-                max_y = max(max_y, point.imag)
-                min_x = min(min_x, point.real)
-                min_y = min(min_y, point.imag)
-
-        # new_path_strings.append(' '.join(f"L {point.real},{max_y - point.imag}" for point in points))
-    default_y = default_x * max_y / max_x
-    ET.SubElement(WhiteboardDescription, "DiagonallyOppositeCoords", x=str(default_x), y=str(default_y))
-    ET.SubElement(WhiteboardDescription, "VerticallyOppositeCoords", x=str(min_x * default_x / max_x), y=str(default_y))
-    ET.SubElement(WhiteboardDescription, "HorizontallyOppositeCoords", x=str(default_x), y=str(min_y * default_y / max_y))
-    stroke_set = ET.SubElement(xmlroot, "StrokeSet")
-    points = []
-    index = 0
-    for path_string in path_strings:
-        stroke = ET.SubElement(stroke_set, "Stroke", colour="black")
-        path = parse_path(path_string)
-        str_point = path[0].point(0)
-        str_x = str(default_x * str_point.real / max_x)
-        str_y = str(default_y * (max_y - str_point.imag) / max_y)
-        # ET.SubElement(stroke, "Point", x=str(str_x), y=str(str_y))
-        str_path = "M" + str_x + " " + str_y + " "
-        new_path_strings.append(str_path)
-        # for curve in path:
-        for i in range(1, len(path)):
-            curve = path[i]
-            for t in np.linspace(0, 1, num_points):
-                point = curve.point(t)
-                points.append(point)
-                ET.SubElement(stroke, "Point", x=str(default_x * point.real / max_x), y=str(default_y * (max_y - point.imag) / max_y))
-
-        new_path_strings.append(' '.join(
-            f"L {default_x * point.real / max_x},{default_y * (max_y - point.imag) / max_y}" for point in points))
-
-        # Create a new SVG XML file with the point-based paths
-        svg_output = stroke_dir + str(index) + '.svg'
-        with open(svg_output, 'w') as f:
-            f.write('<?xml version="1.0" encoding="utf-8"?>\n')
-            f.write('<svg xmlns="http://www.w3.org/2000/svg" ')
-            f.write(f' viewBox="0,0,{default_x},{default_y}" width="100%">\n')
-            f.write('<path d="')
-            for new_path_string in new_path_strings:
-                f.write(new_path_string)
-            f.write('"/>')
-            f.write('</svg>\n')
-        index += 1
-
-    # Create an ElementTree object
-    tree = ET.ElementTree(xmlroot)
-    ET.indent(tree, space="\t", level=0)
-
-    # Write the tree to an XML file
-    tree.write(xml_output, encoding="utf-8")
-
-
-svg_dir = "svg_files/tm"
-out_dir = "svg_files/new"
-xml_dir = "svg_files/xml"
-stroke_history_dir = "svg_files/stroke_history/"
-svg_files = [f for f in listdir(svg_dir) if isfile(join(svg_dir, f))]
-
-for svg_file in svg_files:
-    name, suffix = os.path.splitext(svg_file)
-    input_path = join(svg_dir, svg_file)
-    # output_path = join(out_dir, svg_file)
-    xml_path = join(xml_dir, name + '.xml')
-    stroke_dir = stroke_history_dir + name + "/"
-    if not os.path.exists(stroke_dir):
-        os.makedirs(stroke_dir)
-    bezier_to_points(input_path, stroke_dir, xml_path, 10)
-# test_input = "svg_files/1.svg"
-# test_output = "svg_files/2.svg"
-# xml_path = "svg_files/3.xml"
-# bezier_to_points(test_input, stroke_history_dir, xml_path, 60)
+def get_first_pos(path, matrix=IDENTITY):
+    # Sort key: the x coordinate of a parsed path's starting point (after
+    # applying matrix)
+    return float(apply_transform(matrix, path.start)[0])
+
+
+def parse_paths(path_strings):
+    """
+    Parse each SVG path 'd' string exactly once, returning a list of
+    svgoutline.path_segments.Segments in the same order.
+    """
+    return [parse_path_data(path_string) for path_string in path_strings]
+
+
+def get_page_bottom(svg_attrib):
+    """
+    Return the y coordinate (in user units) of the bottom of the page
+    described by the root <svg> element's attributes (or None if neither a
+    viewBox nor height is given).
+    """
+    view_box = parse_numbers(svg_attrib.get("viewBox", ""))
+    if len(view_box) == 4:
+        return float(view_box[1] + view_box[3])
+    if "height" in svg_attrib:
+        # Without a viewBox, user units are CSS pixels
+        pixels_per_mm = 96.0 / MM_PER_INCH
+        return css_dimension_to_mm(svg_attrib["height"], pixels_per_mm) * pixels_per_mm
+    return None
+
+
+def bezier_to_points(svg_input, stroke_history_output, xml_output, num_points, tolerance=None, stroke_order="x"):
+    """
+    Convert the paths in an SVG into an IAM handwriting XML file. If
+    stroke_history_output is not None, an SVG with one group per stroke (see
+    svgoutline.stroke_history) is also written there.
+
+    By default every segment is sampled at num_points evenly spaced values of
+    t. If tolerance is given, segments are instead flattened adaptively so that
+    the emitted polyline is never further than tolerance (in output units)
+    from the curve: straight lines become just their end points.
+
+    Strokes are written in order of their starting x coordinate (stroke_order
+    "x") or, with stroke_order "travel", in an order (and direction) which
+    keeps the pen-up distance between them short (see
+    svgoutline.stroke_order).
+
+    Path coordinates are mapped through any 'transform' attributes which apply
+    to them. The output coordinates are those of the page scaled uniformly
+    such that the rightmost point lies at x=default_x, with y measured down
+    from the topmost point. The header's coordinates are measured (in the same
+    units) up from the bottom of the page.
+    """
+    # Extract the path data from the SVG (streamed; see svgoutline.svg_paths)
+    svg_attrib, path_elements = read_paths(svg_input)
+    paths = parse_paths(d for d, transforms in path_elements)
+
+    # Each path's transform into page coordinates with y measured up from the
+    # bottom of the page (which, for potrace output, is the frame of the path
+    # data itself).
+    page_bottom = get_page_bottom(svg_attrib)
+    flip = affine_matrix(1.0, 0.0, 0.0, -1.0, 0.0, page_bottom or 0.0)
+    page_matrices = [flip @ compose_transforms(transforms) for d, transforms in path_elements]
+
+    order = sorted(range(len(paths)), key=lambda i: get_first_pos(paths[i], page_matrices[i]))
+    paths = [paths[i] for i in order]
+    page_matrices = [page_matrices[i] for i in order]
+
+    # Exact bounds of the paths in page coordinates
+    (min_x, min_y), (max_x, max_y) = paths_bounds(paths, page_matrices).tolist()
+    if page_bottom is None:
+        # Without page dimensions, the bottom of the content stands in for the
+        # bottom of the page
+        page_matrices = [translation_matrix(0.0, -min_y) @ m for m in page_matrices]
+        max_y, min_y = max_y - min_y, 0.0
+
+    # Map page coordinates to output coordinates
+    scale = default_x / max_x
+    default_y = scale * max_y
+    normalise = affine_matrix(scale, 0.0, 0.0, -scale, 0.0, default_y)
+    matrices = [normalise @ matrix for matrix in page_matrices]
+
+    if tolerance is None:
+        path_points = (sample_segments(path[1:], num_points).reshape(-1, 2) for path in paths)
+    else:
+        path_points = (
+            flatten_path(path[1:], tolerance / max_scale(matrix))
+            for path, matrix in zip(paths, matrices)
+        )
+
+    # The whole of each stroke is mapped to output coordinates in one go
+    strokes = (
+        (apply_transform(matrix, path.start), apply_transform(matrix, points))
+        for path, matrix, points in zip(paths, matrices, path_points)
+    )
+    if stroke_order == "travel":
+        unordered = list(strokes)
+        order, reversed_, distance = order_strokes([points for start, points in unordered], two_opt=True)
+        strokes = (
+            (unordered[i][1][-1], unordered[i][1][::-1]) if reverse else unordered[i]
+            for i, reverse in zip(order, reversed_)
+        )
+    elif stroke_order != "x":
+        raise ValueError(f"Unknown stroke order {stroke_order!r}")
+
+    with ExitStack() as stack:
+        # Strokes are streamed straight to the output files as they are produced
+        writer = stack.enter_context(IAMWriter(
+            xml_output,
+            (default_x, default_y),
+            (min_x * scale, default_y),
+            (default_x, min_y * scale),
+        ))
+        history = None
+        if stroke_history_output is not None:
+            history = stack.enter_context(StrokeHistoryWriter(stroke_history_output, default_x, default_y))
+
+        for start, stroke_points in strokes:
+            xs, ys = stroke_points.T.tolist()
+            writer.add_stroke(xs, ys)
+
+            # Each stroke's geometry is written to the history exactly once
+            if history is not None:
+                history.add_stroke((str(float(start[0])), str(float(start[1]))), xs, ys)
+
+
+class ConversionTask(namedtuple(
+        "ConversionTask", "svg_input xml_output stroke_history_output num_points tolerance stroke_order")):
+    """
+    The conversion of one file in a batch: the input and output filenames
+    and the arguments for bezier_to_points.
+    """
+
+
+class ConversionResult(namedtuple("ConversionResult", "svg_input xml_output error skipped", defaults=(False,))):
+    """
+    The outcome of converting one file in a batch. 'error' is None on success
+    or a formatted traceback describing the failure. 'skipped' is True if the
+    outputs were already up to date.
+    """
+
+
+def _convert_file(task):
+    # Worker entry point: never raises so that one bad input cannot abort the
+    # rest of the batch. Outputs only appear under their final names once
+    # completely written.
+    try:
+        with atomic_output(task.xml_output) as xml_temp, atomic_output(task.stroke_history_output) as history_temp:
+            bezier_to_points(task.svg_input, history_temp, xml_temp, task.num_points, task.tolerance,
+                             task.stroke_order)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    return ConversionResult(task.svg_input, task.xml_output, error)
+
+
+def _manifest_entry(task):
+    return {
+        "hash": file_hash(task.svg_input),
+        "params": {
+            "num_points": task.num_points,
+            "tolerance": task.tolerance,
+            "stroke_order": task.stroke_order,
+            "default_x": default_x,
+        },
+        "version": __version__,
+        "outputs": [f for f in (task.xml_output, task.stroke_history_output) if f is not None],
+    }
+
+
+def convert_directory(svg_dir, xml_dir, stroke_history_dir=None, num_points=10, tolerance=None, jobs=None,
+                      manifest_path=None, force=False, stroke_order="x"):
+    """
+    Convert every SVG in svg_dir into an IAM XML file in xml_dir (and,
+    optionally, a stroke history SVG in stroke_history_dir).
+
+    Files are converted in parallel by a pool of 'jobs' worker processes
+    (default: one per CPU; 1 converts in this process). Failures are reported
+    per-file rather than aborting the batch.
+
+    If manifest_path is given, the content hash of each input together with
+    the conversion parameters and tool version are recorded in a
+    svgoutline.build_cache.BuildManifest there, and inputs whose outputs are
+    already up to date are skipped (unless force is True). Entries are recorded
+    as each file completes so an interrupted run can be resumed.
+
+    Returns
+    -------
+    [ConversionResult, ...]
+        One result per input file, in sorted filename order regardless of the
+        order in which the conversions completed.
+    """
+    svg_files = sorted(f for f in listdir(svg_dir) if isfile(join(svg_dir, f)))
+
+    os.makedirs(xml_dir, exist_ok=True)
+    if stroke_history_dir is not None:
+        os.makedirs(stroke_history_dir, exist_ok=True)
+
+    tasks = []
+    for svg_file in svg_files:
+        name, suffix = os.path.splitext(svg_file)
+        xml_path = join(xml_dir, name + '.xml')
+        stroke_history_path = None
+        if stroke_history_dir is not None:
+            stroke_history_path = join(stroke_history_dir, name + ".svg")
+        tasks.append(ConversionTask(join(svg_dir, svg_file), xml_path, stroke_history_path, num_points, tolerance,
+                                    stroke_order))
+
+    manifest = BuildManifest(manifest_path) if manifest_path is not None else None
+    results = [None] * len(tasks)
+    pending = []
+    entries = {}
+    for i, task in enumerate(tasks):
+        if manifest is not None:
+            entries[i] = _manifest_entry(task)
+            if not force and manifest.is_up_to_date(task.svg_input, entries[i]):
+                results[i] = ConversionResult(task.svg_input, task.xml_output, None, skipped=True)
+                continue
+        pending.append(i)
+
+    def record(i, result):
+        results[i] = result
+        if manifest is not None:
+            if result.error is None:
+                manifest.record(result.svg_input, entries[i])
+            else:
+                manifest.discard(result.svg_input)
+
+    try:
+        if jobs == 1 or len(pending) <= 1:
+            for i in pending:
+                record(i, _convert_file(tasks[i]))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                # NB: map yields results in submission order
+                chunksize = max(1, len(pending) // (4 * (jobs or os.cpu_count() or 1)))
+                for i, result in zip(pending, pool.map(_convert_file, [tasks[i] for i in pending],
+                                                       chunksize=chunksize)):
+                    record(i, result)
+    finally:
+        if manifest is not None:
+            manifest.compact()
+
+    return results
+
+
+def main(argv=None):
+    parser = ArgumentParser(description="""
+        Convert a directory of SVG files into IAM handwriting XML files.
+    """)
+    parser.add_argument(
+        "svg_dir", nargs="?", default="svg_files/tm",
+        help="Directory of input SVG files. (Default: %(default)s)")
+    parser.add_argument(
+        "xml_dir", nargs="?", default="svg_files/xml",
+        help="Directory to write IAM XML files to. (Default: %(default)s)")
+    parser.add_argument(
+        "--stroke-history-dir", default="svg_files/stroke_history",
+        help="Directory to write stroke history SVGs to. (Default: %(default)s)")
+    parser.add_argument(
+        "--no-stroke-history", action="store_true",
+        help="Do not write stroke history SVGs.")
+    parser.add_argument(
+        "--num-points", "-n", type=int, default=10,
+        help="Samples per path segment. (Default: %(default)s)")
+    parser.add_argument(
+        "--tolerance", "-t", type=float, default=None,
+        help="Flatten curves adaptively to within this distance (in output "
+             "units) instead of using a fixed number of samples per segment.")
+    parser.add_argument(
+        "--stroke-order", choices=["x", "travel"], default="x",
+        help="Order strokes by their starting x coordinate ('x') or to "
+             "minimise pen-up travel between them, drawing strokes backwards "
+             "where that helps ('travel'). (Default: %(default)s)")
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=None,
+        help="Number of worker processes. (Default: one per CPU)")
+    parser.add_argument(
+        "--manifest", default=None,
+        help="Build manifest used to skip inputs whose outputs are up to "
+             "date. (Default: .gen_outline_manifest.jsonl in the XML directory)")
+    parser.add_argument(
+        "--force", "-f", action="store_true",
+        help="Convert every input, even if its outputs are up to date.")
+    args = parser.parse_args(argv)
+
+    stroke_history_dir = None if args.no_stroke_history else args.stroke_history_dir
+    manifest_path = args.manifest
+    if manifest_path is None:
+        manifest_path = join(args.xml_dir, ".gen_outline_manifest.jsonl")
+    results = convert_directory(
+        args.svg_dir, args.xml_dir, stroke_history_dir,
+        args.num_points, args.tolerance, args.jobs,
+        manifest_path, args.force, args.stroke_order)
+
+    failures = [result for result in results if result.error is not None]
+    for result in failures:
+        sys.stderr.write(f"Failed to convert {result.svg_input}:\n{result.error}\n")
+    if failures:
+        sys.stderr.write(f"{len(failures)} of {len(results)} files failed.\n")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
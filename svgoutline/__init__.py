@@ -6,3 +6,4 @@ segments for use with pen plotters or vinyl cutting machines.
 from .version import __version__  # noqa: F401
 from .svg_utils import get_svg_page_size  # noqa: F401
 from .svg_to_outlines import svg_to_outlines  # noqa: F401
+from .stroke_order import order_outlines  # noqa: F401
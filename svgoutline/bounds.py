@@ -0,0 +1,202 @@
+"""
+Exact axis-aligned bounding boxes of paths, computed analytically.
+
+Rather than sampling, the extrema of each segment are found from the roots
+of its derivative: every polynomial segment is handled as a cubic Bezier (see
+:py:mod:`svgoutline.path_segments`) whose derivative is a quadratic in t, and
+an elliptical arc reaches its extremes along each axis at angles given by
+the arctangent of its (transformed) axes. All segments are processed together
+in a handful of vectorised operations.
+
+Since an affine transform of a Bezier curve (or ellipse) is another Bezier
+curve (or ellipse), the bounds of a transformed path are computed exactly by
+transforming the control points (or ellipse axes) rather than the curve.
+"""
+
+import numpy as np
+
+from svgoutline.path_segments import (
+    segments_from_svg_path,
+    ARC_CX,
+    ARC_CY,
+    ARC_RX,
+    ARC_RY,
+    ARC_ROTATION,
+    ARC_THETA,
+    ARC_DELTA,
+)
+from svgoutline.transforms import IDENTITY, apply_transform
+
+
+def cubic_bounds(control_points):
+    """
+    Compute the bounding box of each of a set of cubic Bezier curves.
+
+    Parameters
+    ----------
+    control_points : array (S, 4, 2)
+
+    Returns
+    -------
+    array (S, 2, 2)
+        For each curve, [[min_x, min_y], [max_x, max_y]].
+    """
+    p0, p1, p2, p3 = np.moveaxis(np.asarray(control_points, dtype=float), 1, 0)
+
+    # B'(t) / 3 = a*t^2 + b*t + c
+    a = p3 - 3 * p2 + 3 * p1 - p0
+    b = 2 * (p2 - 2 * p1 + p0)
+    c = p1 - p0
+
+    # Roots of the derivative (per axis) with those which don't exist or lie
+    # outside (0, 1) replaced by t=0 (an end point, which is included anyway)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discriminant = b * b - 4 * a * c
+        sqrt_discriminant = np.sqrt(np.maximum(discriminant, 0))
+        quadratic = np.abs(a) > 1e-12 * (np.abs(b) + np.abs(c) + 1e-300)
+        roots = np.stack(
+            (
+                np.where(quadratic, (-b + sqrt_discriminant) / (2 * a), -c / b),
+                np.where(quadratic, (-b - sqrt_discriminant) / (2 * a), -c / b),
+            ),
+            axis=-1,
+        )
+        valid = (
+            np.where(quadratic, discriminant >= 0, b != 0)[..., np.newaxis]
+            & (roots > 0)
+            & (roots < 1)
+        )
+    t = np.where(valid, roots, 0.0)  # (S, 2 axes, 2 roots)
+
+    # Evaluate each axis at its own roots
+    mt = 1 - t
+    values = (
+        mt**3 * p0[..., np.newaxis]
+        + 3 * mt**2 * t * p1[..., np.newaxis]
+        + 3 * mt * t**2 * p2[..., np.newaxis]
+        + t**3 * p3[..., np.newaxis]
+    )
+    candidates = np.concatenate(
+        (values, p0[..., np.newaxis], p3[..., np.newaxis]), axis=-1
+    )
+    return np.stack((candidates.min(axis=-1), candidates.max(axis=-1)), axis=1)
+
+
+def arc_bounds(arcs, matrix=IDENTITY):
+    """
+    Compute the bounding box of each of a set of elliptical arcs after
+    applying an affine transform.
+
+    Parameters
+    ----------
+    arcs : array (A, 7)
+        Arcs in the centre parameterisation used by
+        :py:attr:`svgoutline.path_segments.Segments.arcs`.
+    matrix : array (3, 3)
+
+    Returns
+    -------
+    array (A, 2, 2)
+        For each arc, [[min_x, min_y], [max_x, max_y]].
+    """
+    arcs = np.asarray(arcs, dtype=float).reshape(-1, 7)
+
+    # Each transformed arc is centre + axes @ (cos(angle), sin(angle))
+    rotation = np.radians(arcs[:, ARC_ROTATION])
+    cosr = np.cos(rotation)
+    sinr = np.sin(rotation)
+    ellipse_axes = np.empty((len(arcs), 2, 2))
+    ellipse_axes[:, 0, 0] = cosr * arcs[:, ARC_RX]
+    ellipse_axes[:, 0, 1] = -sinr * arcs[:, ARC_RY]
+    ellipse_axes[:, 1, 0] = sinr * arcs[:, ARC_RX]
+    ellipse_axes[:, 1, 1] = cosr * arcs[:, ARC_RY]
+    axes = matrix[:2, :2] @ ellipse_axes  # (A, 2, 2)
+    centre = apply_transform(matrix, arcs[:, [ARC_CX, ARC_CY]])
+
+    # Along each axis, the extremes of the full ellipse lie at these angles
+    # (and the same plus pi).
+    extreme_angle = np.arctan2(axes[:, :, 1], axes[:, :, 0])  # (A, 2)
+    extreme_angles = extreme_angle[..., np.newaxis] + np.array([0.0, np.pi])
+
+    # Keep only those within the arc's sweep, otherwise fall back on the start
+    theta = np.radians(arcs[:, ARC_THETA])[:, np.newaxis, np.newaxis]
+    delta = np.radians(arcs[:, ARC_DELTA])[:, np.newaxis, np.newaxis]
+    # How far along the sweep each angle lies (modulo a full turn)
+    swept = np.where(delta >= 0, extreme_angles - theta, theta - extreme_angles)
+    swept = np.mod(swept, 2 * np.pi)
+    angles = np.where(swept <= np.abs(delta), extreme_angles, theta)
+    ends = np.broadcast_to(
+        np.concatenate((theta, theta + delta), axis=-1), angles.shape
+    )
+    angles = np.concatenate((angles, ends), axis=-1)  # (A, 2 axes, 4)
+
+    values = (
+        centre[..., np.newaxis]
+        + axes[:, :, 0, np.newaxis] * np.cos(angles)
+        + axes[:, :, 1, np.newaxis] * np.sin(angles)
+    )
+    return np.stack((values.min(axis=-1), values.max(axis=-1)), axis=1)
+
+
+def segment_bounds(path, matrix=IDENTITY):
+    """
+    Compute the bounding box of every segment of a path after applying an
+    affine transform.
+
+    Parameters
+    ----------
+    path : svg.path.Path, [svg.path segment, ...] or Segments
+    matrix : array (3, 3)
+
+    Returns
+    -------
+    array (len(path), 2, 2)
+        For each segment, [[min_x, min_y], [max_x, max_y]].
+    """
+    segments = segments_from_svg_path(path)
+    out = cubic_bounds(apply_transform(matrix, segments.control_points))
+    if len(segments.arcs):
+        out[segments.arc_indices] = arc_bounds(segments.arcs, matrix)
+    return out
+
+
+def paths_bounds(paths, matrices=None):
+    """
+    Compute the overall bounding box of a collection of paths, each
+    optionally transformed by its own matrix.
+
+    Parameters
+    ----------
+    paths : [path, ...]
+        Paths as accepted by :py:func:`segment_bounds`.
+    matrices : [array (3, 3), ...] or None
+
+    Returns
+    -------
+    array (2, 2)
+        [[min_x, min_y], [max_x, max_y]]
+
+    Raises
+    ------
+    ValueError
+        If there are no segments.
+    """
+    if matrices is None:
+        matrices = [IDENTITY] * len(paths)
+
+    # All polynomial segments of all paths are bounded in one go
+    segments = [segments_from_svg_path(path) for path in paths]
+    control_points = [
+        apply_transform(matrix, s.control_points)
+        for s, matrix in zip(segments, matrices)
+    ]
+    if not control_points or not sum(len(cp) for cp in control_points):
+        raise ValueError("Cannot compute the bounds of an empty set of paths")
+    bounds = [cubic_bounds(np.concatenate(control_points))]
+    bounds.extend(
+        arc_bounds(s.arcs, matrix)
+        for s, matrix in zip(segments, matrices)
+        if len(s.arcs)
+    )
+    bounds = np.concatenate(bounds)
+    return np.stack((bounds[:, 0].min(axis=0), bounds[:, 1].max(axis=0)))
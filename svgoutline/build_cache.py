@@ -0,0 +1,150 @@
+"""
+Support for incremental (re)builds of generated files.
+
+A :py:class:`BuildManifest` records, for each input, a hash of its content
+along with the parameters and tool version used to generate its outputs. On a
+subsequent run, inputs whose entry is unchanged (and whose outputs still
+exist) can be skipped.
+
+The manifest is stored as a journal of JSON lines which is appended to (and
+flushed) as each input completes, so an interrupted run loses no record of the
+work it finished. Outputs should be written using :py:func:`atomic_output` so
+that an interrupted run never leaves a partially written file behind under
+its final name.
+"""
+
+import os
+import json
+import hashlib
+
+from contextlib import contextmanager
+
+
+def file_hash(filename, block_size=1 << 20):
+    """Return the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@contextmanager
+def atomic_output(filename):
+    """
+    Context manager which yields a temporary filename (in the same directory
+    as filename) to write to in place of filename. When the context exits
+    normally, the temporary file is renamed to filename, atomically replacing
+    any existing file. If an exception is raised, the temporary file is
+    removed and filename is left untouched.
+
+    If filename is None, None is yielded and nothing else is done.
+    """
+    if filename is None:
+        yield None
+        return
+
+    # NB: The PID makes the name unique between concurrent worker processes
+    directory, basename = os.path.split(filename)
+    temp_filename = os.path.join(directory, f".{basename}.{os.getpid()}.tmp")
+    try:
+        yield temp_filename
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+
+
+class BuildManifest(object):
+    """
+    A persistent record of the inputs, parameters and outputs of previous
+    builds.
+
+    Each entry is a JSON-serialisable dictionary describing how an input was
+    built. The special key 'outputs', if present, lists the files generated
+    from the input: an entry is only considered up-to-date if all of these
+    still exist.
+    """
+
+    def __init__(self, filename):
+        self._filename = filename
+        self._entries = {}
+        self._journal = None
+
+        if os.path.exists(filename):
+            with open(filename, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A line truncated by an interrupted run; ignore it
+                        continue
+                    if record["entry"] is None:
+                        self._entries.pop(record["key"], None)
+                    else:
+                        self._entries[record["key"]] = record["entry"]
+
+    @property
+    def filename(self):
+        return self._filename
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """Return the recorded entry for key (or None)."""
+        return self._entries.get(key)
+
+    def is_up_to_date(self, key, entry):
+        """
+        Return True if the recorded entry for key equals entry and all of its
+        outputs exist.
+        """
+        if self._entries.get(key) != entry:
+            return False
+        return all(os.path.exists(output) for output in entry.get("outputs", []))
+
+    def record(self, key, entry):
+        """
+        Record the entry for key, immediately appending it to the journal on
+        disk.
+        """
+        if self._journal is None:
+            directory = os.path.dirname(self._filename)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._journal = open(self._filename, "a", encoding="utf-8")
+        self._entries[key] = entry
+        self._journal.write(json.dumps({"key": key, "entry": entry}) + "\n")
+        self._journal.flush()
+
+    def discard(self, key):
+        """Forget the entry for key (if any), e.g. after a failed build."""
+        if self._entries.pop(key, None) is not None:
+            self.record(key, None)
+            del self._entries[key]
+
+    def compact(self):
+        """
+        Atomically rewrite the journal with a single line per entry.
+        """
+        self.close()
+        with atomic_output(self._filename) as temp_filename:
+            with open(temp_filename, "w", encoding="utf-8") as f:
+                for key, entry in sorted(self._entries.items()):
+                    f.write(json.dumps({"key": key, "entry": entry}) + "\n")
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
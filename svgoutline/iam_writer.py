@@ -0,0 +1,150 @@
+"""
+A streaming writer for IAM On-Line Handwriting Database style XML files.
+
+Rather than building an ElementTree with one Element per ``<Point>`` and
+serialising it at the end, strokes are written to a buffered file as they are
+produced so memory use is bounded by the size of a single stroke. The output
+is byte-for-byte identical to that produced by serialising the equivalent
+ElementTree with ``ElementTree.indent(tree, space="\\t")`` and
+``tree.write(filename, encoding="utf-8")`` (i.e. tab indented, with no XML
+declaration)::
+
+    <WhiteboardCaptureSession>
+        <WhiteboardDescription>
+            <SensorLocation corner="top_left" />
+            <DiagonallyOppositeCoords x="..." y="..." />
+            <VerticallyOppositeCoords x="..." y="..." />
+            <HorizontallyOppositeCoords x="..." y="..." />
+        </WhiteboardDescription>
+        <StrokeSet>
+            <Stroke colour="black">
+                <Point x="..." y="..." />
+                ...
+            </Stroke>
+            ...
+        </StrokeSet>
+    </WhiteboardCaptureSession>
+
+Since the ``<WhiteboardDescription>`` header records the extent of the whole
+document, the bounds must be known (e.g. computed in a prior pass) before the
+writer is created.
+"""
+
+from xml.sax.saxutils import escape
+
+
+def _quote(value):
+    # Escape an attribute value in the same way as ElementTree
+    return escape(str(value), {'"': "&quot;", "\n": "&#10;"})
+
+
+class IAMWriter(object):
+    """
+    Writes an IAM XML document incrementally, one stroke at a time.
+
+    May be used as a context manager, in which case the document is completed
+    (and the file closed, if opened by the writer) on exit.
+    """
+
+    def __init__(
+        self,
+        file,
+        diagonally_opposite_coords,
+        vertically_opposite_coords,
+        horizontally_opposite_coords,
+        sensor_location="top_left",
+        buffer_size=1 << 16,
+    ):
+        """
+        Parameters
+        ----------
+        file : str or file-like
+            The filename to write to or an open (text-mode) file object.
+        diagonally_opposite_coords : (x, y)
+        vertically_opposite_coords : (x, y)
+        horizontally_opposite_coords : (x, y)
+            The values of the corresponding ``<WhiteboardDescription>``
+            elements. Values are converted to strings using ``str``.
+        sensor_location : str
+            The 'corner' attribute of the ``<SensorLocation>`` element.
+        buffer_size : int
+            The size of the write buffer used when 'file' is a filename.
+        """
+        if hasattr(file, "write"):
+            self._file = file
+            self._owns_file = False
+        else:
+            self._file = open(file, "w", encoding="utf-8", buffering=buffer_size)
+            self._owns_file = True
+
+        self._num_strokes = 0
+        self._closed = False
+
+        self._file.write(
+            "<WhiteboardCaptureSession>\n"
+            "\t<WhiteboardDescription>\n"
+            f'\t\t<SensorLocation corner="{_quote(sensor_location)}" />\n'
+        )
+        for name, (x, y) in [
+            ("DiagonallyOppositeCoords", diagonally_opposite_coords),
+            ("VerticallyOppositeCoords", vertically_opposite_coords),
+            ("HorizontallyOppositeCoords", horizontally_opposite_coords),
+        ]:
+            self._file.write(f'\t\t<{name} x="{_quote(x)}" y="{_quote(y)}" />\n')
+        self._file.write("\t</WhiteboardDescription>\n")
+
+        # NB: The opening <StrokeSet> tag is completed when the first stroke
+        # is written (or self-closed if there are no strokes).
+        self._file.write("\t<StrokeSet")
+
+    @property
+    def num_strokes(self):
+        """The number of strokes written so far."""
+        return self._num_strokes
+
+    def add_stroke(self, xs, ys, colour="black"):
+        """
+        Write a stroke.
+
+        Parameters
+        ----------
+        xs, ys : [float or str, ...]
+            The coordinates of the points in the stroke. Values are converted
+            to strings using ``str``.
+        colour : str
+        """
+        if self._num_strokes == 0:
+            self._file.write(">\n")
+        self._num_strokes += 1
+
+        stroke = f'\t\t<Stroke colour="{_quote(colour)}"'
+        if len(xs) == 0:
+            self._file.write(stroke + " />\n")
+            return
+
+        self._file.write(stroke + ">\n")
+        self._file.write(
+            "".join(f'\t\t\t<Point x="{x}" y="{y}" />\n' for x, y in zip(xs, ys))
+        )
+        self._file.write("\t\t</Stroke>\n")
+
+    def close(self):
+        """Complete the document (and close the file if opened by the writer)."""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._num_strokes == 0:
+            self._file.write(" />\n")
+        else:
+            self._file.write("\t</StrokeSet>\n")
+        self._file.write("</WhiteboardCaptureSession>")
+
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
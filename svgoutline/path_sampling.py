@@ -0,0 +1,263 @@
+"""
+Vectorised sampling of paths, either parsed by the svg.path library or given
+as a :py:class:`svgoutline.path_segments.Segments`.
+
+Rather than calling ``segment.point(t)`` once per sample, every polynomial
+segment of a path (lines, quadratic and cubic Beziers and moves) is converted
+into an equivalent set of cubic Bezier control points. All segments are then
+evaluated together against a precomputed cubic Bernstein basis matrix in a
+single batched operation. Elliptical arcs, which are not polynomial, are
+evaluated separately (but still vectorised) from their centre
+parameterisation.
+
+As well as sampling at a fixed number of points per segment, paths may be
+flattened adaptively to within a given tolerance (see
+:py:func:`flatten_segments`).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from svgoutline.path_segments import (
+    segments_from_svg_path,
+    ARC_CX,
+    ARC_CY,
+    ARC_RX,
+    ARC_RY,
+    ARC_ROTATION,
+    ARC_THETA,
+    ARC_DELTA,
+)
+
+
+@lru_cache(maxsize=None)
+def bernstein_basis(degree, num_points):
+    """
+    Return the Bernstein basis matrix for a Bezier curve of the given degree
+    evaluated at num_points evenly spaced values of t from 0 to 1 (inclusive).
+
+    Returns
+    -------
+    array (num_points, degree + 1)
+        Row i holds the weight of each control point at the i-th value of t.
+        The returned array is cached and read-only.
+    """
+    t = np.linspace(0, 1, num_points)[:, np.newaxis]
+    k = np.arange(degree + 1)
+    binomial = np.array([_binomial(degree, i) for i in k], dtype=float)
+    basis = binomial * (1 - t) ** (degree - k) * t**k
+    basis.setflags(write=False)
+    return basis
+
+
+def _binomial(n, k):
+    out = 1
+    for i in range(k):
+        out = out * (n - i) // (i + 1)
+    return out
+
+
+def _evaluate_arcs(arcs, index, t):
+    """
+    Evaluate elliptical arcs, given by their centre parameterisation (see
+    :py:attr:`svgoutline.path_segments.Segments.arcs`), at arbitrary parameter
+    values. Point i is evaluated on arcs[index[i]] at t[i]. Returns an array
+    (len(t), 2).
+    """
+    arcs = arcs[index]
+    angle = np.radians(arcs[:, ARC_THETA] + arcs[:, ARC_DELTA] * t)
+    rotation = np.radians(arcs[:, ARC_ROTATION])
+    cosr = np.cos(rotation)
+    sinr = np.sin(rotation)
+    cosa = np.cos(angle) * arcs[:, ARC_RX]
+    sina = np.sin(angle) * arcs[:, ARC_RY]
+
+    out = np.empty((len(t), 2))
+    out[:, 0] = cosr * cosa - sinr * sina + arcs[:, ARC_CX]
+    out[:, 1] = sinr * cosa + cosr * sina + arcs[:, ARC_CY]
+    return out
+
+
+def _sample_arcs(arcs, num_points):
+    """
+    Evaluate an array of arcs (see :py:func:`_evaluate_arcs`) at num_points
+    evenly spaced values of t. Returns an array (len(arcs), num_points, 2).
+    """
+    index = np.repeat(np.arange(len(arcs)), num_points)
+    t = np.tile(np.linspace(0, 1, num_points), len(arcs))
+    return _evaluate_arcs(arcs, index, t).reshape(len(arcs), num_points, 2)
+
+
+def _split_segments(path):
+    """
+    Split the segments of a path into polynomial segments and non-degenerate
+    arcs. Returns (poly_indices, poly_control_points, arc_indices, arcs) where
+    poly_control_points is an array (num_poly, 4, 2) and arcs is an array
+    (num_arcs, 7) of centre parameters.
+    """
+    segments = segments_from_svg_path(path)
+    poly_indices = segments.polynomial_indices
+    return (
+        poly_indices,
+        segments.control_points[poly_indices],
+        segments.arc_indices,
+        segments.arcs,
+    )
+
+
+def sample_segments(path, num_points):
+    """
+    Sample every segment of a path at num_points evenly spaced values
+    of t.
+
+    Parameters
+    ----------
+    path : svg.path.Path, [svg.path segment, ...] or Segments
+    num_points : int
+        Number of samples per segment (including both end points).
+
+    Returns
+    -------
+    array (len(path), num_points, 2)
+        The (x, y) coordinates sampled along each segment, in path order.
+    """
+    out = np.empty((len(path), num_points, 2))
+
+    poly_indices, control_points, arc_indices, arcs = _split_segments(path)
+
+    if len(poly_indices):
+        basis = bernstein_basis(3, num_points)
+        out[poly_indices] = np.einsum("tk,skd->std", basis, control_points)
+
+    if len(arcs):
+        out[arc_indices] = _sample_arcs(arcs, num_points)
+
+    return out
+
+
+def sample_path(path, num_points):
+    """
+    Sample every segment of a path at num_points evenly spaced values
+    of t, returning a single (N, 2) array of (x, y) coordinates where N is
+    ``len(path) * num_points``.
+    """
+    return sample_segments(path, num_points).reshape(-1, 2)
+
+
+def _subdivision_counts(control_points, arcs, tolerance):
+    """
+    Return the number of equal-t pieces each polynomial segment and each arc
+    must be split into for the resulting polyline to stay within tolerance of
+    the true curve.
+    """
+    # For a cubic, the distance between the curve and the chord of any piece
+    # spanning h in t is at most h^2/8 * max|B''(t)|, and |B''(t)| is bounded
+    # by 6 times the largest second difference of the control points (Wang's
+    # formula). Straight lines (and moves) have zero second differences and so
+    # remain a single piece.
+    p = control_points
+    second_differences = np.concatenate(
+        (p[:, 0] - 2 * p[:, 1] + p[:, 2], p[:, 1] - 2 * p[:, 2] + p[:, 3]), axis=1
+    ).reshape(-1, 2, 2)
+    max_second_difference = np.linalg.norm(second_differences, axis=2).max(
+        axis=1, initial=0.0
+    )
+    poly_counts = np.ceil(np.sqrt(0.75 * max_second_difference / tolerance))
+
+    # For an arc of radius r, a chord subtending angle phi deviates from the arc
+    # by r * (1 - cos(phi / 2)).
+    radius = np.abs(arcs[:, [ARC_RX, ARC_RY]]).max(axis=1)
+    max_angle = 2 * np.arccos(np.clip(1 - tolerance / radius, -1.0, 1.0))
+    delta = np.radians(np.abs(arcs[:, ARC_DELTA]))
+    arc_counts = np.ceil(delta / np.maximum(max_angle, 1e-12))
+
+    return (
+        np.maximum(poly_counts, 1).astype(int),
+        np.maximum(arc_counts, 1).astype(int),
+    )
+
+
+def flatten_segments(path, tolerance):
+    """
+    Adaptively flatten every segment of a path into a polyline which
+    deviates from the true curve by no more than tolerance.
+
+    Each segment is divided into the smallest number of equal-t pieces which
+    guarantees the requested tolerance, so straight lines (and closepaths)
+    produce just their two end points while long, tightly curved segments
+    receive many.
+
+    Parameters
+    ----------
+    path : svg.path.Path, [svg.path segment, ...] or Segments
+    tolerance : float
+        The maximum permitted distance between the polyline and the curve, in
+        the same units as the path coordinates.
+
+    Returns
+    -------
+    [array (n, 2), ...]
+        One array of (x, y) coordinates per segment, in path order. Each
+        includes both of the segment's end points.
+    """
+    if tolerance <= 0:
+        raise ValueError("tolerance must be positive")
+
+    poly_indices, control_points, arc_indices, arcs = _split_segments(path)
+    poly_counts, arc_counts = _subdivision_counts(control_points, arcs, tolerance)
+
+    counts = np.empty(len(path), dtype=int)
+    counts[poly_indices] = poly_counts + 1
+    counts[arc_indices] = arc_counts + 1
+    ends = np.cumsum(counts)
+    out = np.empty((ends[-1] if len(path) else 0, 2))
+
+    if len(poly_indices):
+        positions, index, t = _flat_samples(poly_indices, poly_counts, ends)
+        out[positions] = np.einsum("tk,tkd->td", _cubic_basis(t), control_points[index])
+    if len(arcs):
+        positions, index, t = _flat_samples(arc_indices, arc_counts, ends)
+        out[positions] = _evaluate_arcs(arcs, index, t)
+
+    return np.split(out, ends[:-1])
+
+
+def _flat_samples(indices, pieces, ends):
+    """
+    Work out where the samples of a set of segments should be evaluated when
+    each segment indices[i] is to be split into pieces[i] equal-t pieces.
+
+    Returns (positions, index, t): the output position of each sample, the
+    position within 'indices' of the segment the sample lies on and its value
+    of t.
+    """
+    num_samples = pieces + 1
+    index = np.repeat(np.arange(len(indices)), num_samples)
+    local = np.arange(len(index)) - np.repeat(
+        np.cumsum(num_samples) - num_samples, num_samples
+    )
+    positions = np.repeat(ends[indices] - num_samples, num_samples) + local
+    return positions, index, local / pieces[index]
+
+
+def _cubic_basis(t):
+    """Cubic Bernstein basis evaluated at arbitrary t. Returns (len(t), 4)."""
+    t = np.asarray(t)[:, np.newaxis]
+    k = np.arange(4)
+    return np.array([1.0, 3.0, 3.0, 1.0]) * (1 - t) ** (3 - k) * t**k
+
+
+def flatten_path(path, tolerance):
+    """
+    Adaptively flatten a path (see :py:func:`flatten_segments`) into
+    a single (N, 2) array of (x, y) coordinates. Points which duplicate their
+    predecessor (e.g. where one segment ends and the next begins) are removed.
+    """
+    segments = flatten_segments(path, tolerance)
+    if not segments:
+        return np.empty((0, 2))
+    points = np.concatenate(segments)
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.any(points[1:] != points[:-1], axis=1)
+    return points[keep]
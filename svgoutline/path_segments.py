@@ -0,0 +1,403 @@
+"""
+An array-based representation of the segments of an SVG path.
+
+Every segment of a path is described by the four control points of a cubic
+Bezier curve which exactly reproduces it: lines (including closepaths) and
+quadratic Beziers are degree-elevated and moves become stationary curves.
+Elliptical arcs are not polynomial and are additionally described by their
+centre parameterisation.
+
+:py:func:`parse_path_data` builds this representation directly from SVG path
+data using the bulk tokeniser in :py:mod:`svgoutline.svg_tokenizer`, without
+creating a Python object per segment. :py:func:`segments_from_svg_path`
+converts a path already parsed by the svg.path library. The two produce
+identical results.
+"""
+
+import numpy as np
+
+from svg.path import Linear, CubicBezier, QuadraticBezier, Arc, Move
+
+from svgoutline.svg_tokenizer import tokenize_path, PATH_COMMAND_ARITY
+
+# Columns of Segments.arcs
+ARC_CX = 0
+ARC_CY = 1
+ARC_RX = 2
+ARC_RY = 3
+ARC_ROTATION = 4
+ARC_THETA = 5
+ARC_DELTA = 6
+
+
+class Segments(object):
+    """
+    The segments of a path, in array form.
+
+    Attributes
+    ----------
+    control_points : array (S, 4, 2)
+        The cubic Bezier control points of each segment. For elliptical arcs,
+        these describe the straight chord between the arc's end points.
+    arc_indices : array (A,) of int
+        The indices of the segments which are elliptical arcs.
+    arcs : array (A, 7)
+        The centre parameterisation of each arc: centre (cx, cy), radii (rx,
+        ry, already scaled up if too small to span the end points), x-axis
+        rotation, start angle (theta) and sweep (delta). Angles are given in
+        degrees. See the ARC_* column constants.
+    """
+
+    def __init__(self, control_points, arc_indices=None, arcs=None):
+        self.control_points = np.asarray(control_points, dtype=float).reshape(-1, 4, 2)
+        if arc_indices is None:
+            arc_indices = []
+        if arcs is None:
+            arcs = []
+        self.arc_indices = np.asarray(arc_indices, dtype=int).reshape(-1)
+        self.arcs = np.asarray(arcs, dtype=float).reshape(-1, 7)
+
+    def __len__(self):
+        return len(self.control_points)
+
+    def __getitem__(self, index):
+        """Slice the segments, e.g. ``segments[1:]``."""
+        if not isinstance(index, slice):
+            raise TypeError("Segments may only be sliced")
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            raise ValueError("Segments may only be sliced contiguously")
+        keep = (self.arc_indices >= start) & (self.arc_indices < stop)
+        return Segments(
+            self.control_points[start:stop],
+            self.arc_indices[keep] - start,
+            self.arcs[keep],
+        )
+
+    @property
+    def start(self):
+        """The (x, y) coordinates of the start of the path (as Python floats)."""
+        return tuple(self.control_points[0, 0].tolist())
+
+    @property
+    def polynomial_indices(self):
+        """The indices of the segments which are not elliptical arcs."""
+        mask = np.ones(len(self), dtype=bool)
+        mask[self.arc_indices] = False
+        return np.flatnonzero(mask)
+
+
+def is_degenerate_arc(arc):
+    """
+    Return True if an svg.path Arc is really a straight line (or a point), as
+    treated by svg.path's Arc.point.
+    """
+    return arc.start == arc.end or arc.radius.real == 0 or arc.radius.imag == 0
+
+
+def segment_control_points(segment):
+    """
+    Return the four cubic Bezier control points (as complex numbers) which
+    exactly reproduce the given polynomial svg.path segment. Lines (including
+    Close) and quadratic Beziers are degree-elevated; moves become a
+    stationary curve.
+
+    Raises TypeError for segments which cannot be represented exactly (i.e.
+    non-degenerate arcs).
+    """
+    if isinstance(segment, CubicBezier):
+        return (segment.start, segment.control1, segment.control2, segment.end)
+    elif isinstance(segment, QuadraticBezier):
+        p0, p1, p2 = segment.start, segment.control, segment.end
+        return (p0, p0 + (2 / 3) * (p1 - p0), p2 + (2 / 3) * (p1 - p2), p2)
+    elif isinstance(segment, Move):
+        return (segment.start,) * 4
+    elif isinstance(segment, Linear) or (
+        isinstance(segment, Arc) and is_degenerate_arc(segment)
+    ):
+        # NB: Linear covers both Line and Close
+        p0, p1 = segment.start, segment.end
+        d = p1 - p0
+        return (p0, p0 + d / 3, p0 + 2 * d / 3, p1)
+    else:
+        raise TypeError("Cannot convert {!r} to control points".format(segment))
+
+
+def segments_from_svg_path(path):
+    """
+    Convert a path parsed by svg.path (or any sequence of svg.path segments)
+    into a :py:class:`Segments`. Segments instances are returned unchanged.
+    """
+    if isinstance(path, Segments):
+        return path
+
+    control_points = []
+    arc_indices = []
+    arcs = []
+    for i, segment in enumerate(path):
+        if isinstance(segment, Arc) and not is_degenerate_arc(segment):
+            arc_indices.append(i)
+            radius = segment.radius * segment.radius_scale
+            arcs.append(
+                (
+                    segment.center.real,
+                    segment.center.imag,
+                    radius.real,
+                    radius.imag,
+                    segment.rotation,
+                    segment.theta,
+                    segment.delta,
+                )
+            )
+            d = segment.end - segment.start
+            control_points.append(
+                (
+                    segment.start,
+                    segment.start + d / 3,
+                    segment.start + 2 * d / 3,
+                    segment.end,
+                )
+            )
+        else:
+            control_points.append(segment_control_points(segment))
+
+    control_points = np.array(control_points, dtype=complex).reshape(-1, 4)
+    control_points = np.stack((control_points.real, control_points.imag), -1)
+    return Segments(control_points, arc_indices, arcs)
+
+
+def arc_centre_parameters(start, end, radius, rotation, large_arc, sweep):
+    """
+    Convert elliptical arcs from the endpoint parameterisation used in SVG
+    path data into the centre parameterisation used by
+    :py:attr:`Segments.arcs` (following the SVG implementation notes, F.6.5).
+
+    Parameters
+    ----------
+    start, end : array (A, 2)
+    radius : array (A, 2)
+        The (rx, ry) radii given in the path data.
+    rotation : array (A,)
+        The x-axis rotation (degrees).
+    large_arc, sweep : array (A,) of bool
+
+    Returns
+    -------
+    array (A, 7)
+    """
+    rotation = np.asarray(rotation, dtype=float)
+    cosr = np.cos(np.radians(rotation))
+    sinr = np.sin(np.radians(rotation))
+    dx = (start[:, 0] - end[:, 0]) / 2
+    dy = (start[:, 1] - end[:, 1]) / 2
+    x1prim = cosr * dx + sinr * dy
+    y1prim = -sinr * dx + cosr * dy
+    x1prim_sq = x1prim * x1prim
+    y1prim_sq = y1prim * y1prim
+
+    rx = np.abs(radius[:, 0])
+    ry = np.abs(radius[:, 1])
+
+    # Correct out of range radii (the SVG spec only scales up)
+    radius_scale = (x1prim_sq / (rx * rx)) + (y1prim_sq / (ry * ry))
+    radius_scale = np.where(radius_scale > 1, np.sqrt(radius_scale), 1.0)
+    rx = rx * radius_scale
+    ry = ry * radius_scale
+    rx_sq = rx * rx
+    ry_sq = ry * ry
+
+    t1 = rx_sq * y1prim_sq
+    t2 = ry_sq * x1prim_sq
+    c = np.sqrt(np.abs((rx_sq * ry_sq - t1 - t2) / (t1 + t2)))
+    c = np.where(np.asarray(large_arc) == np.asarray(sweep), -c, c)
+    cxprim = c * rx * y1prim / ry
+    cyprim = -c * ry * x1prim / rx
+
+    cx = (cosr * cxprim - sinr * cyprim) + ((start[:, 0] + end[:, 0]) / 2)
+    cy = (sinr * cxprim + cosr * cyprim) + ((start[:, 1] + end[:, 1]) / 2)
+
+    ux = (x1prim - cxprim) / rx
+    uy = (y1prim - cyprim) / ry
+    vx = (-x1prim - cxprim) / rx
+    vy = (-y1prim - cyprim) / ry
+
+    n = np.sqrt(ux * ux + uy * uy)
+    theta = np.degrees(np.arccos(ux / n))
+    theta = np.where(uy < 0, -theta, theta) % 360
+
+    n = np.sqrt((ux * ux + uy * uy) * (vx * vx + vy * vy))
+    d = np.clip((ux * vx + uy * vy) / n, -1.0, 1.0)
+    delta = np.degrees(np.arccos(d))
+    delta = np.where((ux * vy - uy * vx) < 0, -delta, delta) % 360
+    delta = np.where(sweep, delta, delta - 360)
+
+    return np.stack((cx, cy, rx, ry, rotation, theta, delta), axis=1)
+
+
+def parse_path_data(d):
+    """
+    Parse SVG path data directly into a :py:class:`Segments`.
+
+    The segments produced (and the floating point values of their control
+    points) are identical to those produced by converting the output of
+    ``svg.path.parse_path(d)`` with :py:func:`segments_from_svg_path`: one
+    segment per (possibly implicit) command, including a stationary segment
+    for each moveto.
+
+    Raises ValueError if the path data is malformed.
+    """
+    commands, values, offsets = tokenize_path(d)
+
+    # NB: Working on plain Python floats here is considerably faster than
+    # indexing into NumPy arrays for the short paths typical of traced
+    # handwriting. The (comparatively expensive) arc conversion is performed
+    # in bulk at the end.
+    values = values.tolist()
+    offsets = offsets.tolist()
+
+    control_points = []
+    arc_indices = []
+    arc_endpoints = []
+    x = y = 0.0  # Current point
+    subpath_x = subpath_y = 0.0
+    # Second control point of the previous cubic Bezier (or None) and control
+    # point of the previous quadratic Bezier (or None), for smooth curves.
+    previous_control2 = None
+    previous_control = None
+
+    for k, command in enumerate(commands.tolist()):
+        upper = command.upper()
+        relative = command != upper
+        arity = PATH_COMMAND_ARITY[upper]
+
+        if arity == 0:
+            # Closepath
+            dx = subpath_x - x
+            dy = subpath_y - y
+            control_points.append(
+                (
+                    x,
+                    y,
+                    x + dx / 3,
+                    y + dy / 3,
+                    x + 2 * dx / 3,
+                    y + 2 * dy / 3,
+                    subpath_x,
+                    subpath_y,
+                )
+            )
+            x, y = subpath_x, subpath_y
+            previous_control2 = previous_control = None
+            continue
+
+        for i in range(offsets[k], offsets[k + 1], arity):
+            args = values[i : i + arity]
+            control2 = control = None
+
+            if upper == "M":
+                ex, ey = args
+                if relative:
+                    ex += x
+                    ey += y
+                control_points.append((ex, ey) * 4)
+                subpath_x, subpath_y = ex, ey
+                # Implicit repeats of a moveto are linetos
+                upper = "L"
+            elif upper == "C" or upper == "S":
+                if upper == "C":
+                    c1x, c1y, c2x, c2y, ex, ey = args
+                    if relative:
+                        c1x += x
+                        c1y += y
+                else:
+                    c2x, c2y, ex, ey = args
+                    if previous_control2 is None:
+                        c1x, c1y = x, y
+                    else:
+                        c1x = x + x - previous_control2[0]
+                        c1y = y + y - previous_control2[1]
+                if relative:
+                    c2x += x
+                    c2y += y
+                    ex += x
+                    ey += y
+                control_points.append((x, y, c1x, c1y, c2x, c2y, ex, ey))
+                control2 = (c2x, c2y)
+            elif upper == "Q" or upper == "T":
+                if upper == "Q":
+                    qx, qy, ex, ey = args
+                    if relative:
+                        qx += x
+                        qy += y
+                else:
+                    ex, ey = args
+                    if previous_control is None:
+                        qx, qy = x, y
+                    else:
+                        qx = x + x - previous_control[0]
+                        qy = y + y - previous_control[1]
+                if relative:
+                    ex += x
+                    ey += y
+                # Degree elevated
+                control_points.append(
+                    (
+                        x,
+                        y,
+                        x + (2 / 3) * (qx - x),
+                        y + (2 / 3) * (qy - y),
+                        ex + (2 / 3) * (qx - ex),
+                        ey + (2 / 3) * (qy - ey),
+                        ex,
+                        ey,
+                    )
+                )
+                control = (qx, qy)
+            else:
+                # Straight lines and arcs
+                if upper == "H":
+                    ex = args[0] + x if relative else args[0]
+                    ey = y
+                elif upper == "V":
+                    ex = x
+                    ey = args[0] + y if relative else args[0]
+                else:
+                    ex, ey = args[-2:]
+                    if relative:
+                        ex += x
+                        ey += y
+                # Degenerate arcs are treated as straight lines
+                if upper == "A" and (ex != x or ey != y) and args[0] and args[1]:
+                    arc_indices.append(len(control_points))
+                    arc_endpoints.append((x, y, ex, ey) + tuple(args[:5]))
+                dx = ex - x
+                dy = ey - y
+                control_points.append(
+                    (
+                        x,
+                        y,
+                        x + dx / 3,
+                        y + dy / 3,
+                        x + 2 * dx / 3,
+                        y + 2 * dy / 3,
+                        ex,
+                        ey,
+                    )
+                )
+
+            x, y = ex, ey
+            previous_control2 = control2
+            previous_control = control
+
+    arcs = None
+    if arc_endpoints:
+        arc_endpoints = np.array(arc_endpoints)
+        arcs = arc_centre_parameters(
+            arc_endpoints[:, 0:2],
+            arc_endpoints[:, 2:4],
+            arc_endpoints[:, 4:6],
+            arc_endpoints[:, 6],
+            arc_endpoints[:, 7] != 0,
+            arc_endpoints[:, 8] != 0,
+        )
+    return Segments(control_points, arc_indices, arcs)
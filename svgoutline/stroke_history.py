@@ -0,0 +1,79 @@
+"""
+Incremental "stroke history" SVG output.
+
+A stroke history shows the order in which the strokes of a handwriting sample
+are drawn. Rather than writing one SVG per stroke (each repeating every stroke
+drawn so far), the whole history is written to a single SVG in which every
+stroke appears exactly once, in its own ``<g>`` group::
+
+    <svg ...>
+    <g id="stroke-0" class="stroke"><path d="M... L..."/></g>
+    <g id="stroke-1" class="stroke"><path d="M... L..."/></g>
+    ...
+    </svg>
+
+A viewer can replay the history by revealing the groups in document order.
+Output size (and write time) is therefore linear in the number of strokes.
+"""
+
+
+class StrokeHistoryWriter(object):
+    """
+    Writes a stroke history SVG incrementally: each stroke is written to the
+    file as soon as it is added.
+
+    May be used as a context manager, in which case the file is closed (and
+    the SVG completed) on exit.
+    """
+
+    def __init__(self, filename, width, height):
+        """
+        Parameters
+        ----------
+        filename : str
+            The SVG file to (over)write.
+        width, height : float
+            The dimensions of the SVG's viewBox.
+        """
+        self._file = open(filename, "w")
+        self._num_strokes = 0
+
+        self._file.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        self._file.write('<svg xmlns="http://www.w3.org/2000/svg" ')
+        self._file.write(f' viewBox="0,0,{width},{height}" width="100%">\n')
+
+    @property
+    def num_strokes(self):
+        """The number of strokes written so far."""
+        return self._num_strokes
+
+    def add_stroke(self, start, xs, ys):
+        """
+        Append a stroke to the history.
+
+        Parameters
+        ----------
+        start : (x, y)
+            The point the stroke starts at.
+        xs, ys : [float, ...]
+            The coordinates of the subsequent points along the stroke.
+        """
+        self._file.write(
+            f'<g id="stroke-{self._num_strokes}" class="stroke"><path d="'
+            f"M{start[0]} {start[1]} "
+        )
+        self._file.write(" ".join(f"L {x},{y}" for x, y in zip(xs, ys)))
+        self._file.write('"/></g>\n')
+        self._num_strokes += 1
+
+    def close(self):
+        """Complete the SVG and close the file."""
+        if not self._file.closed:
+            self._file.write("</svg>\n")
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
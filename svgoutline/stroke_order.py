@@ -0,0 +1,281 @@
+"""
+Reordering strokes to minimise pen-up travel.
+
+When plotting, the pen must be lifted and moved from the end of one stroke
+to the start of the next. For documents with many strokes, this travel can
+account for a large part of the total plotting time when strokes are drawn
+in document order.
+
+:py:func:`order_strokes` finds a short ordering using a greedy nearest
+neighbour search (accelerated by a uniform grid over stroke end points),
+optionally allowing strokes to be drawn backwards and optionally refining the
+result with 2-opt moves. :py:func:`order_outlines` applies this to the output
+of :py:func:`svgoutline.svg_to_outlines`.
+"""
+
+import math
+
+import numpy as np
+
+
+class _EndpointGrid(object):
+    """
+    A uniform grid of points supporting nearest-neighbour queries and
+    removal.
+    """
+
+    def __init__(self, points):
+        self._points = points
+        if len(points):
+            self._origin = points.min(axis=0)
+            extent = points.max(axis=0) - self._origin
+            # Aim for roughly one point per cell
+            area = max(extent[0], 1e-12) * max(extent[1], 1e-12)
+            self._cell_size = max(math.sqrt(area / len(points)), 1e-12)
+        else:
+            self._origin = np.zeros(2)
+            self._cell_size = 1.0
+
+        self._cells = {}
+        cells = np.floor((points - self._origin) / self._cell_size).astype(int)
+        for i, cell in enumerate(map(tuple, cells.tolist())):
+            self._cells.setdefault(cell, set()).add(i)
+        if self._cells:
+            cell_array = np.array(list(self._cells))
+            self._min_cell = cell_array.min(axis=0).tolist()
+            self._max_cell = cell_array.max(axis=0).tolist()
+        self._num_points = len(points)
+
+    def __len__(self):
+        return self._num_points
+
+    def remove(self, i):
+        cell = tuple(
+            np.floor((self._points[i] - self._origin) / self._cell_size)
+            .astype(int)
+            .tolist()
+        )
+        self._cells[cell].remove(i)
+        if not self._cells[cell]:
+            del self._cells[cell]
+        self._num_points -= 1
+
+    def nearest(self, point):
+        """
+        Return the index of the (remaining) point nearest to point, or None if
+        none remain.
+        """
+        if not self._num_points:
+            return None
+
+        px, py = point
+        cx = math.floor((px - self._origin[0]) / self._cell_size)
+        cy = math.floor((py - self._origin[1]) / self._cell_size)
+        # The number of rings (of cells around (cx, cy)) which could possibly
+        # contain points
+        max_ring = max(
+            abs(cx - self._min_cell[0]),
+            abs(cx - self._max_cell[0]),
+            abs(cy - self._min_cell[1]),
+            abs(cy - self._max_cell[1]),
+        )
+
+        best = None
+        best_distance = math.inf
+        for ring in range(max_ring + 1):
+            for cell in _ring_cells(cx, cy, ring):
+                for i in self._cells.get(cell, ()):
+                    x, y = self._points[i]
+                    distance = math.hypot(x - px, y - py)
+                    if distance < best_distance or (
+                        distance == best_distance and i < best
+                    ):
+                        best = i
+                        best_distance = distance
+            # Any point beyond this ring is at least this far away
+            if best is not None and best_distance <= ring * self._cell_size:
+                break
+        return best
+
+
+def _ring_cells(cx, cy, ring):
+    # The cells forming the square ring 'ring' cells out from (cx, cy)
+    if ring == 0:
+        yield (cx, cy)
+        return
+    for x in range(cx - ring, cx + ring + 1):
+        yield (x, cy - ring)
+        yield (x, cy + ring)
+    for y in range(cy - ring + 1, cy + ring):
+        yield (cx - ring, y)
+        yield (cx + ring, y)
+
+
+def pen_up_distance(strokes, start=(0.0, 0.0)):
+    """
+    Return the total distance travelled between strokes when drawing them in
+    the order given, starting from start. Empty strokes are ignored.
+    """
+    position = np.asarray(start, dtype=float)
+    total = 0.0
+    for stroke in strokes:
+        stroke = np.asarray(stroke, dtype=float).reshape(-1, 2)
+        if len(stroke):
+            total += float(np.hypot(*(stroke[0] - position)))
+            position = stroke[-1]
+    return total
+
+
+def _two_opt(starts, ends, start, max_passes):
+    """
+    Refine an ordering of strokes, given as arrays of their (oriented) start
+    and end points, in place using 2-opt moves. Returns the permutation
+    applied and an array indicating which strokes were reversed.
+
+    Each move reverses a run of strokes i..j: the run is drawn in reverse
+    order with every stroke in it drawn backwards. This changes only the
+    connections into and out of the run.
+    """
+    n = len(starts)
+    permutation = np.arange(n)
+    reversed_ = np.zeros(n, dtype=bool)
+
+    for _ in range(max_passes):
+        improved = False
+        for i in range(n):
+            previous = ends[i - 1] if i > 0 else start
+            j = np.arange(i, n)
+            # Connections out of the run (none after the final stroke)
+            following = np.zeros((len(j), 2))
+            following[:-1] = starts[i + 1 :]
+            has_following = j < n - 1
+
+            old = np.hypot(*(previous - starts[i])) + np.where(
+                has_following, np.hypot(*(ends[j] - following).T), 0.0
+            )
+            new = np.hypot(*(previous - ends[j]).T) + np.where(
+                has_following, np.hypot(*(starts[i] - following).T), 0.0
+            )
+            gain = old - new
+            best = int(np.argmax(gain))
+            if gain[best] > 1e-9:
+                k = i + best
+                starts[i : k + 1], ends[i : k + 1] = (
+                    ends[i : k + 1][::-1].copy(),
+                    starts[i : k + 1][::-1].copy(),
+                )
+                permutation[i : k + 1] = permutation[i : k + 1][::-1].copy()
+                reversed_[i : k + 1] = ~reversed_[i : k + 1][::-1]
+                improved = True
+        if not improved:
+            break
+
+    return permutation, reversed_
+
+
+def order_strokes(
+    strokes, start=(0.0, 0.0), allow_reversal=True, two_opt=False, max_passes=10
+):
+    """
+    Find an order in which to draw a set of strokes which keeps the pen-up
+    travel between them short.
+
+    Parameters
+    ----------
+    strokes : [array (N, 2) or [(x, y), ...], ...]
+        The strokes, each a sequence of (x, y) coordinates.
+    start : (x, y)
+        The starting position of the pen.
+    allow_reversal : bool
+        If True, strokes may be drawn backwards (from their last point to
+        their first).
+    two_opt : bool
+        If True, refine the greedy ordering using 2-opt moves. This requires
+        allow_reversal.
+    max_passes : int
+        The maximum number of 2-opt passes over the strokes.
+
+    Returns
+    -------
+    order : [int, ...]
+        The indices of the strokes in the order to be drawn. Empty strokes
+        are placed last.
+    reversed : [bool, ...]
+        For each entry in order, True if that stroke should be drawn
+        backwards.
+    distance : float
+        The total pen-up distance (including the move from start).
+    """
+    if two_opt and not allow_reversal:
+        raise ValueError("2-opt refinement requires allow_reversal")
+
+    strokes = [np.asarray(stroke, dtype=float).reshape(-1, 2) for stroke in strokes]
+    non_empty = [i for i, stroke in enumerate(strokes) if len(stroke)]
+    empty = [i for i, stroke in enumerate(strokes) if not len(stroke)]
+
+    # End points: 2k is the first point of non_empty[k], 2k+1 the last
+    first = np.array([strokes[i][0] for i in non_empty]).reshape(-1, 2)
+    last = np.array([strokes[i][-1] for i in non_empty]).reshape(-1, 2)
+    endpoints = np.stack((first, last), axis=1).reshape(-1, 2)
+    grid = _EndpointGrid(endpoints)
+    if not allow_reversal:
+        for k in range(len(non_empty)):
+            grid.remove(2 * k + 1)
+
+    # Greedy nearest neighbour
+    order = []
+    reversed_ = []
+    position = tuple(map(float, start))
+    while len(grid):
+        endpoint = grid.nearest(position)
+        k, is_last = divmod(endpoint, 2)
+        order.append(k)
+        reversed_.append(bool(is_last))
+        grid.remove(endpoint)
+        if allow_reversal:
+            grid.remove(endpoint ^ 1)
+        position = tuple((first if is_last else last)[k].tolist())
+
+    order = np.array(order, dtype=int)
+    reversed_ = np.array(reversed_, dtype=bool)
+    if two_opt and len(order):
+        starts = np.where(reversed_[:, np.newaxis], last[order], first[order])
+        ends = np.where(reversed_[:, np.newaxis], first[order], last[order])
+        permutation, flipped = _two_opt(
+            starts, ends, np.asarray(start, dtype=float), max_passes
+        )
+        order = order[permutation]
+        reversed_ = reversed_[permutation] ^ flipped
+
+    order = [non_empty[k] for k in order.tolist()] + empty
+    reversed_ = reversed_.tolist() + [False] * len(empty)
+    distance = pen_up_distance(
+        (strokes[i][::-1] if r else strokes[i] for i, r in zip(order, reversed_)),
+        start,
+    )
+    return order, reversed_, distance
+
+
+def order_outlines(outlines, start=(0.0, 0.0), allow_reversal=True, two_opt=True):
+    """
+    Reorder the outlines produced by :py:func:`svgoutline.svg_to_outlines` to
+    minimise pen-up travel (see :py:func:`order_strokes`).
+
+    Returns
+    -------
+    outlines : [(colour, width, [(x, y), ...]), ...]
+        The reordered outlines. Reversed outlines have their lines reversed.
+    distance : float
+        The total pen-up distance (in mm, including the move from start).
+    """
+    order, reversed_, distance = order_strokes(
+        [line for colour, width, line in outlines],
+        start=start,
+        allow_reversal=allow_reversal,
+        two_opt=two_opt,
+    )
+    out = []
+    for i, reverse in zip(order, reversed_):
+        colour, width, line = outlines[i]
+        out.append((colour, width, list(reversed(line)) if reverse else line))
+    return out, distance
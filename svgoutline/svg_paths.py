@@ -0,0 +1,90 @@
+"""
+Streaming extraction of path data from SVG files.
+
+Unlike the utilities in :py:mod:`svgoutline.svg_utils`, which operate on a
+fully parsed ElementTree, the functions here parse the SVG incrementally using
+``ElementTree.iterparse``. Elements are discarded as soon as they have been
+processed so memory use does not grow with the number of paths in the
+document.
+"""
+
+from xml.etree import ElementTree
+
+
+def _local_name(tag):
+    # Strip any "{namespace}" prefix from an ElementTree tag
+    return tag.rpartition("}")[2]
+
+
+def iter_paths(source):
+    """
+    Iterate over the ``<path>`` elements of an SVG in document order.
+
+    Parameters
+    ----------
+    source : str or file-like
+        The filename of (or a binary file object containing) the SVG.
+
+    Yields
+    ------
+    (d, transforms)
+        The path's 'd' attribute (or an empty string if it has none) and a
+        tuple of the 'transform' attribute values which apply to it, ordered
+        from the outermost ancestor down to (and including) the path itself.
+        Elements without a transform contribute nothing to this tuple.
+    """
+    return _iter_paths(source, {})
+
+
+def _iter_paths(source, svg_attrib):
+    # As iter_paths but also copies the attributes of the root element into
+    # svg_attrib as soon as it has been read.
+
+    # The transform attribute (or None) of each currently open element
+    transform_stack = []
+    # The currently open elements. Finished elements are removed from their
+    # parent so that the tree held by iterparse never grows.
+    element_stack = []
+
+    for event, element in ElementTree.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if not element_stack:
+                svg_attrib.update(element.attrib)
+            transform_stack.append(element.get("transform"))
+            element_stack.append(element)
+        else:
+            if _local_name(element.tag) == "path":
+                yield (
+                    element.get("d", ""),
+                    tuple(t for t in transform_stack if t is not None),
+                )
+
+            transform_stack.pop()
+            element_stack.pop()
+            element.clear()
+            if element_stack:
+                element_stack[-1].remove(element)
+
+
+def get_path_strings(source):
+    """
+    Return a list of the 'd' attributes of every ``<path>`` in an SVG, in
+    document order.
+    """
+    return [d for d, transforms in iter_paths(source)]
+
+
+def read_paths(source):
+    """
+    Read every ``<path>`` element of an SVG along with the attributes of the
+    root ``<svg>`` element.
+
+    Returns
+    -------
+    (svg_attrib, paths)
+        The root element's attribute dictionary and a list of the (d,
+        transforms) pairs produced by :py:func:`iter_paths`.
+    """
+    svg_attrib = {}
+    paths = list(_iter_paths(source, svg_attrib))
+    return svg_attrib, paths
@@ -0,0 +1,176 @@
+"""
+Bulk tokenisers for the numeric micro-syntaxes used in SVG attributes: path
+data ('d'), point lists ('points') and transform lists ('transform').
+
+Rather than consuming the input a character or number at a time in Python,
+each tokeniser finds all of the numbers in a single regular expression pass
+and converts them to floats in one NumPy operation.
+"""
+
+import re
+
+import numpy as np
+
+# An SVG number (see the 'number' production in the SVG path grammar). Note
+# that "1.5.5" is two numbers ("1.5" and ".5") and "1-2" is two numbers ("1"
+# and "-2").
+NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+PATH_COMMANDS = "MmZzLlHhVvCcSsQqTtAa"
+
+# The number of arguments consumed by each (upper-case) path command
+PATH_COMMAND_ARITY = {
+    "M": 2,
+    "Z": 0,
+    "L": 2,
+    "H": 1,
+    "V": 1,
+    "C": 6,
+    "S": 4,
+    "Q": 4,
+    "T": 2,
+    "A": 7,
+}
+
+TRANSFORM_RE = re.compile(
+    r"\s*(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)\s*,?"
+)
+
+# Once every number in some path data has been replaced by a '#', a command
+# letter followed by its (marked) arguments and anything which may not appear
+# at all.
+_COMMAND_RE = re.compile(f"([{PATH_COMMANDS}])([^{PATH_COMMANDS}]*)")
+_INVALID_RE = re.compile(f"[^{PATH_COMMANDS}# \t\r\n,]")
+
+# A single set of arc arguments, allowing for flags which are not separated
+# from the following argument (e.g. "a1 1 0 01.5 2")
+_ARC_ARGUMENTS_RE = re.compile(
+    r"\s*,?\s*".join(
+        [f"({NUMBER_RE.pattern})"] * 3 + ["([01])"] * 2 + [f"({NUMBER_RE.pattern})"] * 2
+    )
+)
+
+
+def parse_numbers(text):
+    """
+    Return all of the numbers in a string as a 1D float array.
+    """
+    return np.array(NUMBER_RE.findall(text), dtype=float)
+
+
+def parse_points(text):
+    """
+    Parse the 'points' attribute of a ``<polyline>`` or ``<polygon>``,
+    returning an (N, 2) array of (x, y) coordinates. As suggested by the SVG
+    specification's error handling rules, a trailing unpaired coordinate is
+    ignored.
+    """
+    numbers = parse_numbers(text)
+    return numbers[: len(numbers) // 2 * 2].reshape(-1, 2)
+
+
+def tokenize_path(d):
+    """
+    Split SVG path data into its commands and their numerical arguments.
+
+    Parameters
+    ----------
+    d : str
+        The path data (e.g. the 'd' attribute of a ``<path>``).
+
+    Returns
+    -------
+    commands : array (K,) of single-character strings
+        The command letters, in order, exactly as written. Implicitly repeated
+        commands are *not* expanded (e.g. "l1 2 3 4" is one command with four
+        arguments).
+    values : array (M,) of float
+        All of the numerical arguments.
+    offsets : array (K + 1,) of int
+        The arguments of commands[k] are values[offsets[k]:offsets[k + 1]].
+
+    Raises
+    ------
+    ValueError
+        If the path data contains unexpected characters, does not start with a
+        command or a command has the wrong number of arguments.
+    """
+    numbers = NUMBER_RE.findall(d)
+    marked = NUMBER_RE.sub("#", d)
+    if _INVALID_RE.search(marked):
+        raise ValueError("Invalid characters in path data {!r}".format(d))
+
+    first = _COMMAND_RE.search(marked)
+    if "#" in marked[: first.start() if first else len(marked)]:
+        raise ValueError("Path data does not start with a command {!r}".format(d))
+
+    command_list = []
+    counts = []
+    # Commands with the wrong number of arguments
+    bad = []
+    for command, arguments in _COMMAND_RE.findall(marked):
+        count = arguments.count("#")
+        arity = PATH_COMMAND_ARITY[command.upper()]
+        if (count % arity or count == 0) if arity else count:
+            bad.append(len(command_list))
+        command_list.append(command)
+        counts.append(count)
+    commands = np.array(command_list, dtype="U1")
+    offsets = np.zeros(len(counts) + 1, dtype=int)
+    np.cumsum(counts, out=offsets[1:])
+    values = np.array(numbers, dtype=float)
+
+    if bad:
+        if all(command_list[k] in "Aa" for k in bad):
+            # Arc flags needn't be separated from the following number which
+            # the bulk tokeniser cannot distinguish: re-tokenise these arcs.
+            return _retokenize_arcs(d, commands, values, offsets, bad)
+        raise ValueError("Wrong number of arguments in path data {!r}".format(d))
+
+    return commands, values, offsets
+
+
+def _retokenize_arcs(d, commands, values, offsets, bad):
+    arguments = re.split(f"[{PATH_COMMANDS}]", d)[1:]
+    runs = [values[offsets[k] : offsets[k + 1]] for k in range(len(commands))]
+    for k in bad:
+        text = arguments[k].strip()
+        run = []
+        while text:
+            match = _ARC_ARGUMENTS_RE.match(text)
+            if not match:
+                raise ValueError("Invalid arc in path data {!r}".format(d))
+            run.extend(map(float, match.groups()))
+            text = text[match.end() :].lstrip(" \t\r\n,")
+        runs[k] = np.array(run)
+    counts = np.array([len(run) for run in runs], dtype=int)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    return commands, np.concatenate(runs) if runs else values, offsets
+
+
+def parse_transform(text):
+    """
+    Parse an SVG 'transform' attribute into a list of its transform functions.
+
+    Returns
+    -------
+    [(name, array of float), ...]
+        The transform functions in the order written (i.e. outermost first),
+        e.g. ``[("translate", array([0., 49.])), ("scale", array([.1, -.1]))]``.
+
+    Raises
+    ------
+    ValueError
+        If the attribute is malformed.
+    """
+    out = []
+    end = 0
+    text = text.strip()
+    for match in TRANSFORM_RE.finditer(text):
+        if match.start() != end:
+            break
+        out.append((match.group(1), parse_numbers(match.group(2))))
+        end = match.end()
+    if end != len(text):
+        raise ValueError("Invalid transform {!r}".format(text))
+    return out
@@ -8,6 +8,7 @@ import re
 
 from copy import deepcopy
 
+from svgoutline.svg_tokenizer import parse_points
 
 # Relevant XML namespace URIs used by SVGs
 SVG_NAMESPACE = "http://www.w3.org/2000/svg"
@@ -158,14 +159,8 @@ def lines_polylines_and_polygons_to_paths(root):
         for poly in root.findall(f".//{{{SVG_NAMESPACE}}}{tag}"):
             poly.tag = f"{{{SVG_NAMESPACE}}}path"
 
-            # NB: Since this function is a workaround which hopefully won't
-            # stick around forever I'm deliberately taking a casual approach to
-            # parsing here since this will work for any valid (or
-            # defacto-valid, i.e. comma-separated) SVG.
-            points = map(
-                float, re.split(r"\s*(?:,|\s)\s*", poly.attrib.pop("points").strip())
-            )
-            d = "M" + "L".join(f"{x} {y}" for x, y in zip(points, points))
+            points = parse_points(poly.attrib.pop("points")).tolist()
+            d = "M" + "L".join(f"{x} {y}" for x, y in points)
             if closed:
                 d += "Z"
             poly.set("d", d)
@@ -0,0 +1,106 @@
+"""
+2D affine transforms, represented as 3x3 homogeneous matrices.
+
+These are used to map path coordinates through the chain of SVG 'transform'
+attributes which apply to them (and any further normalisation) in a single
+matrix multiply per path.
+"""
+
+import numpy as np
+
+from svgoutline.svg_tokenizer import parse_transform
+
+IDENTITY = np.eye(3)
+IDENTITY.setflags(write=False)
+
+
+def affine_matrix(a, b, c, d, e, f):
+    """
+    Return the 3x3 matrix for the SVG transform 'matrix(a b c d e f)', i.e.
+    mapping (x, y) to (a*x + c*y + e, b*x + d*y + f).
+    """
+    return np.array([[a, c, e], [b, d, f], [0.0, 0.0, 1.0]])
+
+
+def translation_matrix(tx, ty=0.0):
+    return affine_matrix(1.0, 0.0, 0.0, 1.0, tx, ty)
+
+
+def scale_matrix(sx, sy=None):
+    return affine_matrix(sx, 0.0, 0.0, sx if sy is None else sy, 0.0, 0.0)
+
+
+def rotation_matrix(angle, cx=0.0, cy=0.0):
+    """Rotation by angle degrees about (cx, cy)."""
+    cos = np.cos(np.radians(angle))
+    sin = np.sin(np.radians(angle))
+    rotation = affine_matrix(cos, sin, -sin, cos, 0.0, 0.0)
+    if cx == 0 and cy == 0:
+        return rotation
+    return translation_matrix(cx, cy) @ rotation @ translation_matrix(-cx, -cy)
+
+
+def skew_x_matrix(angle):
+    return affine_matrix(1.0, 0.0, np.tan(np.radians(angle)), 1.0, 0.0, 0.0)
+
+
+def skew_y_matrix(angle):
+    return affine_matrix(1.0, np.tan(np.radians(angle)), 0.0, 1.0, 0.0, 0.0)
+
+
+# {name: (function, valid argument counts), ...}
+_TRANSFORM_FUNCTIONS = {
+    "matrix": (affine_matrix, (6,)),
+    "translate": (translation_matrix, (1, 2)),
+    "scale": (scale_matrix, (1, 2)),
+    "rotate": (rotation_matrix, (1, 3)),
+    "skewX": (skew_x_matrix, (1,)),
+    "skewY": (skew_y_matrix, (1,)),
+}
+
+
+def transform_matrix(transform):
+    """
+    Return the 3x3 matrix equivalent to an SVG 'transform' attribute value
+    (e.g. "translate(0,49) scale(0.1,-0.1)").
+
+    Raises ValueError if the transform is malformed.
+    """
+    matrix = IDENTITY
+    for name, args in parse_transform(transform):
+        function, arg_counts = _TRANSFORM_FUNCTIONS[name]
+        if len(args) not in arg_counts:
+            raise ValueError(
+                "Wrong number of arguments for {}() in {!r}".format(name, transform)
+            )
+        # NB: The first function listed is outermost (i.e. applied last)
+        matrix = matrix @ function(*args.tolist())
+    return matrix
+
+
+def compose_transforms(transforms):
+    """
+    Return the 3x3 matrix for a chain of SVG 'transform' attribute values,
+    ordered from the outermost ancestor inwards (as produced by
+    :py:func:`svgoutline.svg_paths.iter_paths`).
+    """
+    matrix = IDENTITY
+    for transform in transforms:
+        matrix = matrix @ transform_matrix(transform)
+    return matrix
+
+
+def apply_transform(matrix, points):
+    """
+    Apply a 3x3 affine matrix to an array (..., 2) of (x, y) coordinates,
+    returning a new array of the same shape.
+    """
+    return np.asarray(points) @ matrix[:2, :2].T + matrix[:2, 2]
+
+
+def max_scale(matrix):
+    """
+    Return the largest factor by which the matrix can stretch a distance (i.e.
+    the largest singular value of its linear part).
+    """
+    return float(np.linalg.svd(matrix[:2, :2], compute_uv=False)[0])
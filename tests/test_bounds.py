@@ -0,0 +1,71 @@
+import pytest
+
+import numpy as np
+
+from svg.path import parse_path
+
+from svgoutline.bounds import cubic_bounds, arc_bounds, segment_bounds, paths_bounds
+from svgoutline.path_segments import parse_path_data
+from svgoutline.path_sampling import sample_segments
+from svgoutline.transforms import IDENTITY, transform_matrix, apply_transform
+
+
+def test_cubic_bounds():
+    # Symmetric hump peaking at y=75 (t=0.5), between its control points
+    out = cubic_bounds([[(0, 0), (0, 100), (100, 100), (100, 0)]])
+    assert np.allclose(out, [[[0, 0], [100, 75]]])
+
+
+def test_cubic_bounds_straight_line():
+    out = cubic_bounds([[(0, 0), (1, 1), (2, 2), (3, 3)]])
+    assert np.allclose(out, [[[0, 0], [3, 3]]])
+
+
+def test_arc_bounds():
+    # Semicircle from (0, 0) to (10, 0) through (5, -5)
+    segments = parse_path_data("M0,0 A5,5 0 0,1 10,0")
+    out = arc_bounds(segments.arcs)
+    assert np.allclose(out, [[[0, -5], [10, 0]]])
+
+
+@pytest.mark.parametrize(
+    "d",
+    [
+        "M95 390 c-21 -23 -13 -50 14 -50 23 0 45 34 37 56 -8 20 -30 17 -51 -6z",
+        "M0,0 Q50,80 100,0 T200,0 L10,10",
+        "M0,0 A5,5 0 0,1 10,0 A3,6 30 1,0 20,5 A40,20 15 1,1 60,10 A0,5 0 0,1 1,1",
+        "M0,0 A3,6 -30 0,0 -20,5 a4,4 0 1,0 -5,-5",
+    ],
+)
+@pytest.mark.parametrize(
+    "transform", ["", "translate(0,49) scale(0.1,-0.1)", "rotate(30) skewX(20)"]
+)
+def test_segment_bounds_match_dense_samples(d, transform):
+    matrix = transform_matrix(transform)
+    path = parse_path(d)
+    out = segment_bounds(path, matrix)
+
+    samples = apply_transform(matrix, sample_segments(path, 10001))
+    exp = np.stack((samples.min(axis=1), samples.max(axis=1)), axis=1)
+
+    # Exact bounds enclose every sample and are (almost) reached
+    assert np.all(out[:, 0] <= exp[:, 0] + 1e-9)
+    assert np.all(out[:, 1] >= exp[:, 1] - 1e-9)
+    assert np.allclose(out, exp, atol=1e-4)
+
+    # Segments give the same answer
+    assert np.allclose(segment_bounds(parse_path_data(d), matrix), out)
+
+
+def test_paths_bounds():
+    paths = [parse_path_data("M0,0 L1,1"), parse_path_data("M5,5 A1,1 0 0,1 7,5")]
+    assert np.allclose(paths_bounds(paths), [[0, 0], [7, 5]])
+    assert np.allclose(
+        paths_bounds(paths, [IDENTITY, transform_matrix("translate(10)")]),
+        [[0, 0], [17, 5]],
+    )
+
+
+def test_paths_bounds_empty():
+    with pytest.raises(ValueError):
+        paths_bounds([])
@@ -0,0 +1,96 @@
+import pytest
+
+import os
+
+from svgoutline.build_cache import BuildManifest, atomic_output, file_hash
+
+
+def test_file_hash(tmp_path):
+    a = tmp_path / "a"
+    b = tmp_path / "b"
+    a.write_bytes(b"hello")
+    b.write_bytes(b"hello")
+    assert file_hash(str(a)) == file_hash(str(b))
+    assert len(file_hash(str(a))) == 64
+
+    b.write_bytes(b"world")
+    assert file_hash(str(a)) != file_hash(str(b))
+
+
+class TestAtomicOutput(object):
+    def test_success(self, tmp_path):
+        filename = str(tmp_path / "out.txt")
+        with atomic_output(filename) as temp_filename:
+            assert temp_filename != filename
+            with open(temp_filename, "w") as f:
+                f.write("hello")
+            assert not os.path.exists(filename)
+        assert open(filename).read() == "hello"
+        assert os.listdir(str(tmp_path)) == ["out.txt"]
+
+    def test_failure_leaves_original(self, tmp_path):
+        filename = str(tmp_path / "out.txt")
+        with open(filename, "w") as f:
+            f.write("original")
+
+        with pytest.raises(RuntimeError):
+            with atomic_output(filename) as temp_filename:
+                with open(temp_filename, "w") as f:
+                    f.write("partial")
+                raise RuntimeError()
+
+        assert open(filename).read() == "original"
+        assert os.listdir(str(tmp_path)) == ["out.txt"]
+
+    def test_none(self):
+        with atomic_output(None) as temp_filename:
+            assert temp_filename is None
+
+
+class TestBuildManifest(object):
+    def test_up_to_date(self, tmp_path):
+        output = tmp_path / "out.xml"
+        output.write_text("")
+        entry = {"hash": "abc", "outputs": [str(output)]}
+
+        manifest = BuildManifest(str(tmp_path / "manifest.jsonl"))
+        assert not manifest.is_up_to_date("in.svg", entry)
+
+        manifest.record("in.svg", entry)
+        assert manifest.is_up_to_date("in.svg", entry)
+        assert not manifest.is_up_to_date("in.svg", dict(entry, hash="def"))
+
+        # Missing outputs aren't up to date
+        output.unlink()
+        assert not manifest.is_up_to_date("in.svg", entry)
+
+    def test_persistence(self, tmp_path):
+        filename = str(tmp_path / "manifest.jsonl")
+        with BuildManifest(filename) as manifest:
+            manifest.record("a", {"hash": 1})
+            manifest.record("b", {"hash": 2})
+            manifest.record("a", {"hash": 3})
+            manifest.discard("b")
+            manifest.discard("c")
+
+        # Journal replayed on load
+        manifest = BuildManifest(filename)
+        assert len(manifest) == 1
+        assert manifest.get("a") == {"hash": 3}
+        assert "b" not in manifest
+
+        # Compaction leaves one line per entry
+        manifest.compact()
+        assert len(open(filename).readlines()) == 1
+        assert BuildManifest(filename).get("a") == {"hash": 3}
+
+    def test_truncated_journal(self, tmp_path):
+        filename = str(tmp_path / "manifest.jsonl")
+        with BuildManifest(filename) as manifest:
+            manifest.record("a", {"hash": 1})
+        with open(filename, "a") as f:
+            f.write('{"key": "b", "ent')
+
+        manifest = BuildManifest(filename)
+        assert manifest.get("a") == {"hash": 1}
+        assert "b" not in manifest
@@ -0,0 +1,211 @@
+import pytest
+
+import os
+
+import numpy as np
+
+from xml.etree import ElementTree
+
+from gen_outline import bezier_to_points, convert_directory
+
+from svgoutline.stroke_order import pen_up_distance
+
+SVG = """<?xml version="1.0" standalone="no"?>
+<svg version="1.0" xmlns="http://www.w3.org/2000/svg"
+ width="30.000000pt" height="49.000000pt" viewBox="0 0 30.000000 49.000000">
+<g transform="translate(0.000000,49.000000) scale(0.100000,-0.100000)"
+fill="#000000" stroke="none">
+<path d="M225 390 c-21 -23 -13 -50 14 -50 23 0 45 34 37 56 -8 20 -30 17 -51
+-6z"/>
+<path d="M95 390 c-21 -23 -13 -50 14 -50 23 0 45 34 37 56 -8 20 -30 17 -51
+-6z"/>
+</g>
+</svg>
+"""
+
+# The same shapes as SVG, without any transforms
+SVG_UNTRANSFORMED = """<svg xmlns="http://www.w3.org/2000/svg"
+ width="30pt" height="49pt" viewBox="0 0 30 49">
+<path d="M22.5 10 c-2.1 2.3 -1.3 5 1.4 5 2.3 0 4.5 -3.4 3.7 -5.6 -0.8 -2 -3 -1.7
+-5.1 0.6z"/>
+<path d="M9.5 10 c-2.1 2.3 -1.3 5 1.4 5 2.3 0 4.5 -3.4 3.7 -5.6 -0.8 -2 -3 -1.7
+-5.1 0.6z"/>
+</svg>
+"""
+
+# The same shapes as SVG with nested transforms
+SVG_NESTED = """<svg xmlns="http://www.w3.org/2000/svg" width="49px" height="49px">
+<g transform="translate(0,49)">
+<g transform="scale(0.2,-0.2)">
+<path transform="scale(0.5)" d="M225 390 c-21 -23 -13 -50 14 -50 23 0 45 34 37 56
+-8 20 -30 17 -51 -6z"/>
+</g>
+<path transform="matrix(0.1,0,0,-0.1,0,0)" d="M95 390 c-21 -23 -13 -50 14 -50 23 0
+45 34 37 56 -8 20 -30 17 -51 -6z"/>
+</g>
+</svg>
+"""
+
+
+@pytest.fixture
+def svg_dir(tmp_path):
+    svg_dir = tmp_path / "svg"
+    svg_dir.mkdir()
+    for name in ["b", "a", "c"]:
+        (svg_dir / (name + ".svg")).write_text(SVG)
+    return svg_dir
+
+
+def read_strokes(xml_path):
+    root = ElementTree.parse(str(xml_path)).getroot()
+    return [
+        [(float(p.attrib["x"]), float(p.attrib["y"])) for p in stroke]
+        for stroke in root.find("StrokeSet")
+    ]
+
+
+class TestBezierToPoints(object):
+    def test_fixed_samples(self, tmp_path, svg_dir):
+        xml_path = tmp_path / "out.xml"
+        history_path = tmp_path / "history.svg"
+        bezier_to_points(str(svg_dir / "a.svg"), str(history_path), str(xml_path), 10)
+
+        strokes = read_strokes(xml_path)
+        # 4 segments (3 curves and a closepath) of 10 samples each
+        assert [len(s) for s in strokes] == [40, 40]
+
+        # Strokes sorted by starting x coordinate
+        assert strokes[0][0][0] < strokes[1][0][0]
+
+        # Output normalised to 400 units wide
+        root = ElementTree.parse(str(xml_path)).getroot()
+        coords = root.find("WhiteboardDescription/DiagonallyOppositeCoords")
+        assert coords.attrib["x"] == "400"
+        # (the exact extent of the curves, which samples needn't quite reach)
+        max_x = max(x for s in strokes for x, y in s)
+        assert max_x <= 400
+        assert max_x == pytest.approx(400, rel=1e-2)
+
+        assert open(str(history_path)).read().count("<g ") == 2
+
+    def test_tolerance(self, tmp_path, svg_dir):
+        xml_path = tmp_path / "out.xml"
+        bezier_to_points(str(svg_dir / "a.svg"), None, str(xml_path), 10, 1.0)
+
+        strokes = read_strokes(xml_path)
+        assert 0 < len(strokes[0]) < 40
+
+    def test_travel_order(self, tmp_path, svg_dir):
+        x_path = tmp_path / "x.xml"
+        travel_path = tmp_path / "travel.xml"
+        bezier_to_points(str(svg_dir / "a.svg"), None, str(x_path), 10)
+        bezier_to_points(
+            str(svg_dir / "a.svg"), None, str(travel_path), 10, stroke_order="travel"
+        )
+
+        # Same strokes, possibly reordered and reversed, with less pen travel
+        x_strokes = read_strokes(x_path)
+        travel_strokes = read_strokes(travel_path)
+        assert sorted(map(sorted, travel_strokes)) == sorted(map(sorted, x_strokes))
+        assert pen_up_distance(travel_strokes) <= pen_up_distance(x_strokes)
+
+        with pytest.raises(ValueError):
+            bezier_to_points(
+                str(svg_dir / "a.svg"), None, str(x_path), 10, stroke_order="bad"
+            )
+
+    @pytest.mark.parametrize(
+        "svg",
+        [
+            # Paths given directly in (y-down) page coordinates
+            SVG_UNTRANSFORMED,
+            # Nested transforms, no viewBox (so the page height comes from
+            # the height attribute, in pixels)
+            SVG_NESTED,
+        ],
+    )
+    def test_transforms(self, tmp_path, svg_dir, svg):
+        # Equivalent documents produce the same output as the potrace one
+        (svg_dir / "other.svg").write_text(svg)
+        bezier_to_points(str(svg_dir / "a.svg"), None, str(tmp_path / "a.xml"), 10)
+        bezier_to_points(
+            str(svg_dir / "other.svg"), None, str(tmp_path / "other.xml"), 10
+        )
+
+        exp = read_strokes(tmp_path / "a.xml")
+        actual = read_strokes(tmp_path / "other.xml")
+        assert np.allclose(actual, exp)
+
+        exp_root = ElementTree.parse(str(tmp_path / "a.xml")).getroot()
+        actual_root = ElementTree.parse(str(tmp_path / "other.xml")).getroot()
+        for exp_coord, actual_coord in zip(
+            exp_root.find("WhiteboardDescription")[1:],
+            actual_root.find("WhiteboardDescription")[1:],
+        ):
+            assert float(actual_coord.attrib["x"]) == pytest.approx(
+                float(exp_coord.attrib["x"])
+            )
+            assert float(actual_coord.attrib["y"]) == pytest.approx(
+                float(exp_coord.attrib["y"])
+            )
+
+
+class TestConvertDirectory(object):
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_order_and_outputs(self, tmp_path, svg_dir, jobs):
+        xml_dir = tmp_path / "xml"
+        history_dir = tmp_path / "history"
+        results = convert_directory(
+            str(svg_dir), str(xml_dir), str(history_dir), jobs=jobs
+        )
+
+        assert [os.path.basename(r.svg_input) for r in results] == [
+            "a.svg",
+            "b.svg",
+            "c.svg",
+        ]
+        assert all(r.error is None for r in results)
+        assert sorted(os.listdir(str(xml_dir))) == ["a.xml", "b.xml", "c.xml"]
+        assert sorted(os.listdir(str(history_dir))) == ["a.svg", "b.svg", "c.svg"]
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_failures_reported(self, tmp_path, svg_dir, jobs):
+        (svg_dir / "broken.svg").write_text("<svg")
+        results = convert_directory(str(svg_dir), str(tmp_path / "xml"), jobs=jobs)
+
+        errors = {os.path.basename(r.svg_input): r.error for r in results}
+        assert errors["broken.svg"] is not None
+        assert "unclosed token" in errors["broken.svg"]
+        assert errors["a.svg"] is None
+        assert errors["c.svg"] is None
+
+    def test_incremental(self, tmp_path, svg_dir):
+        xml_dir = tmp_path / "xml"
+        manifest = str(tmp_path / "manifest.jsonl")
+
+        def convert(**kwargs):
+            results = convert_directory(
+                str(svg_dir), str(xml_dir), jobs=1, manifest_path=manifest, **kwargs
+            )
+            assert all(r.error is None for r in results)
+            return {os.path.basename(r.svg_input): r.skipped for r in results}
+
+        assert convert() == {"a.svg": False, "b.svg": False, "c.svg": False}
+        assert convert() == {"a.svg": True, "b.svg": True, "c.svg": True}
+
+        # Changed inputs, new inputs and deleted outputs are rebuilt
+        (svg_dir / "a.svg").write_text(SVG.replace("M225", "M226"))
+        (svg_dir / "d.svg").write_text(SVG)
+        (xml_dir / "c.xml").unlink()
+        assert convert() == {
+            "a.svg": False,
+            "b.svg": True,
+            "c.svg": False,
+            "d.svg": False,
+        }
+
+        # Changed parameters rebuild everything
+        assert not any(convert(num_points=11).values())
+
+        # As does forcing
+        assert not any(convert(num_points=11, force=True).values())
@@ -0,0 +1,82 @@
+import pytest
+
+import io
+
+from xml.etree import ElementTree
+
+from svgoutline.iam_writer import IAMWriter
+
+
+def element_tree_reference(header, strokes):
+    # Build the equivalent document with ElementTree
+    root = ElementTree.Element("WhiteboardCaptureSession")
+    description = ElementTree.SubElement(root, "WhiteboardDescription")
+    ElementTree.SubElement(description, "SensorLocation", corner="top_left")
+    for name, (x, y) in zip(
+        [
+            "DiagonallyOppositeCoords",
+            "VerticallyOppositeCoords",
+            "HorizontallyOppositeCoords",
+        ],
+        header,
+    ):
+        ElementTree.SubElement(description, name, x=str(x), y=str(y))
+    stroke_set = ElementTree.SubElement(root, "StrokeSet")
+    for xs, ys in strokes:
+        stroke = ElementTree.SubElement(stroke_set, "Stroke", colour="black")
+        for x, y in zip(xs, ys):
+            ElementTree.SubElement(stroke, "Point", x=str(x), y=str(y))
+
+    tree = ElementTree.ElementTree(root)
+    ElementTree.indent(tree, space="\t", level=0)
+    out = io.BytesIO()
+    tree.write(out, encoding="utf-8")
+    return out.getvalue()
+
+
+HEADER = [(400, 589.7799542415513), (72.04731996817664, 589.7799542415513), (400, 6.0)]
+
+
+@pytest.mark.parametrize(
+    "strokes",
+    [
+        # No strokes
+        [],
+        # Empty stroke
+        [([], [])],
+        # Single stroke
+        [([136.8899079395356, 128.3], [27.8108584897736, 39.01])],
+        # Many strokes
+        [([1.0, 2.0, 3.0], [4.0, 5.0, 6.0]), ([], []), ([7.5], [-8.25])],
+    ],
+)
+def test_identical_to_element_tree(tmp_path, strokes):
+    filename = str(tmp_path / "out.xml")
+    with IAMWriter(filename, *HEADER) as writer:
+        for xs, ys in strokes:
+            writer.add_stroke(xs, ys)
+        assert writer.num_strokes == len(strokes)
+
+    with open(filename, "rb") as f:
+        assert f.read() == element_tree_reference(HEADER, strokes)
+
+
+def test_file_object_not_closed():
+    f = io.StringIO()
+    writer = IAMWriter(f, *HEADER)
+    writer.add_stroke([1], [2])
+    writer.close()
+    writer.close()
+
+    assert not f.closed
+    assert f.getvalue().count("</WhiteboardCaptureSession>") == 1
+    root = ElementTree.fromstring(f.getvalue())
+    assert root.find("StrokeSet/Stroke/Point").attrib == {"x": "1", "y": "2"}
+
+
+def test_attribute_escaping():
+    f = io.StringIO()
+    with IAMWriter(f, *HEADER) as writer:
+        writer.add_stroke([1], [2], colour='"<&>"')
+    root = ElementTree.fromstring(f.getvalue())
+    assert root.find("StrokeSet/Stroke").attrib["colour"] == '"<&>"'
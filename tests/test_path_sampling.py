@@ -0,0 +1,141 @@
+import pytest
+
+import numpy as np
+
+from svg.path import parse_path
+
+from svgoutline.path_segments import parse_path_data
+from svgoutline.path_sampling import (
+    bernstein_basis,
+    sample_segments,
+    sample_path,
+    flatten_segments,
+    flatten_path,
+)
+
+
+def reference_samples(path, num_points):
+    # Sample using svg.path's own (scalar) implementation
+    return np.array(
+        [
+            [
+                (p.real, p.imag)
+                for p in (seg.point(t) for t in np.linspace(0, 1, num_points))
+            ]
+            for seg in path
+        ]
+    ).reshape(len(path), num_points, 2)
+
+
+class TestBernsteinBasis(object):
+    @pytest.mark.parametrize("degree", [1, 2, 3, 5])
+    @pytest.mark.parametrize("num_points", [2, 3, 10])
+    def test_partition_of_unity(self, degree, num_points):
+        basis = bernstein_basis(degree, num_points)
+        assert basis.shape == (num_points, degree + 1)
+        assert np.allclose(basis.sum(axis=1), 1.0)
+
+    def test_end_points(self):
+        basis = bernstein_basis(3, 5)
+        assert np.array_equal(basis[0], [1, 0, 0, 0])
+        assert np.array_equal(basis[-1], [0, 0, 0, 1])
+
+    def test_cubic_values(self):
+        basis = bernstein_basis(3, 3)
+        assert np.allclose(basis[1], [0.125, 0.375, 0.375, 0.125])
+
+    def test_read_only(self):
+        with pytest.raises(ValueError):
+            bernstein_basis(3, 4)[0, 0] = 1
+
+
+@pytest.mark.parametrize(
+    "d",
+    [
+        # Potrace-style relative cubic curves with multiple subpaths
+        "M95 390 c-21 -23 -13 -50 14 -50 23 0 45 34 37 56 -8 20 -30 17 -51 -6z "
+        "m32 -65 c12 -49 -41 -125 -87 -125z",
+        # Lines and quadratics
+        "M0,0 L10,0 L10,10 Q15,15 20,10 T30,10 Z",
+        # Arcs, including a rotated one and a degenerate (zero radius) one
+        "M0,0 A5,5 0 0,1 10,0 A3,6 30 1,0 20,5 A0,5 0 0,1 25,5",
+    ],
+)
+@pytest.mark.parametrize("num_points", [2, 10, 33])
+def test_matches_svg_path(d, num_points):
+    path = parse_path(d)
+    samples = sample_segments(path, num_points)
+    assert samples.shape == (len(path), num_points, 2)
+    assert np.allclose(samples, reference_samples(path, num_points))
+
+    # Paths parsed directly into arrays give identical results
+    segments = parse_path_data(d)
+    assert np.array_equal(sample_segments(segments, num_points), samples)
+    assert all(
+        np.array_equal(a, b)
+        for a, b in zip(flatten_segments(segments, 0.1), flatten_segments(path, 0.1))
+    )
+
+
+def test_sample_path_shape():
+    path = parse_path("M0,0 L1,0 L1,1")
+    out = sample_path(path, 4)
+    assert out.shape == (12, 2)
+    assert np.allclose(out[-1], (1, 1))
+
+
+def max_deviation(polyline, dense):
+    # Largest distance from any densely sampled curve point to the polyline
+    a = polyline[:-1][:, np.newaxis]
+    b = polyline[1:][:, np.newaxis]
+    ab = b - a
+    length_sq = np.maximum((ab**2).sum(axis=2), 1e-300)
+    t = np.clip(((dense - a) * ab).sum(axis=2) / length_sq, 0, 1)
+    closest = a + t[..., np.newaxis] * ab
+    return np.linalg.norm(dense - closest, axis=2).min(axis=0).max()
+
+
+class TestFlattenSegments(object):
+    def test_lines_are_two_points(self):
+        path = parse_path("M0,0 L10,0 L10,10 Z")
+        segments = flatten_segments(path, 0.01)
+        assert [len(s) for s in segments] == [2, 2, 2, 2]
+        assert np.allclose(segments[2], [(10, 0), (10, 10)])
+
+    @pytest.mark.parametrize(
+        "d",
+        [
+            "M0,0 C0,100 100,100 100,0",
+            "M0,0 Q50,80 100,0",
+            "M0,0 A40,20 15 1,1 60,10",
+        ],
+    )
+    @pytest.mark.parametrize("tolerance", [2.0, 0.5, 0.05])
+    def test_within_tolerance(self, d, tolerance):
+        path = parse_path(d)
+        (segment,) = path[1:]
+        (polyline,) = flatten_segments([segment], tolerance)
+
+        # End points are exact
+        assert np.allclose(polyline[0], (segment.start.real, segment.start.imag))
+        assert np.allclose(polyline[-1], (segment.end.real, segment.end.imag))
+
+        dense = sample_segments([segment], 2000)[0]
+        assert max_deviation(polyline, dense) <= tolerance
+
+    def test_tighter_tolerance_gives_more_points(self):
+        path = parse_path("M0,0 C0,100 100,100 100,0")
+        coarse = flatten_segments(path, 1.0)[1]
+        fine = flatten_segments(path, 0.01)[1]
+        assert len(fine) > len(coarse) > 2
+
+    def test_invalid_tolerance(self):
+        with pytest.raises(ValueError):
+            flatten_segments(parse_path("M0,0 L1,1"), 0)
+
+
+def test_flatten_path_removes_shared_end_points():
+    path = parse_path("M0,0 L10,0 L10,10 L0,10 Z")
+    assert np.array_equal(
+        flatten_path(path, 0.1), [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]
+    )
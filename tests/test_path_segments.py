@@ -0,0 +1,96 @@
+import pytest
+
+import numpy as np
+
+from svg.path import parse_path, Line, Move, CubicBezier, QuadraticBezier, Arc
+
+from svgoutline.path_segments import (
+    Segments,
+    segment_control_points,
+    segments_from_svg_path,
+    parse_path_data,
+)
+
+
+class TestSegmentControlPoints(object):
+    def test_cubic(self):
+        seg = CubicBezier(0j, 1 + 1j, 2 + 1j, 3 + 0j)
+        assert segment_control_points(seg) == (0j, 1 + 1j, 2 + 1j, 3 + 0j)
+
+    def test_line(self):
+        assert np.allclose(
+            segment_control_points(Line(0j, 3 + 3j)), [0j, 1 + 1j, 2 + 2j, 3 + 3j]
+        )
+
+    def test_move(self):
+        assert segment_control_points(Move(1 + 2j)) == (1 + 2j,) * 4
+
+    def test_quadratic(self):
+        seg = QuadraticBezier(0j, 3 + 3j, 6 + 0j)
+        assert np.allclose(segment_control_points(seg), [0j, 2 + 2j, 4 + 2j, 6 + 0j])
+
+    def test_arc_unsupported(self):
+        with pytest.raises(TypeError):
+            segment_control_points(Arc(0j, 1 + 1j, 0, False, True, 2 + 0j))
+
+
+@pytest.mark.parametrize(
+    "d",
+    [
+        # Potrace-style relative cubics with multiple subpaths
+        "M95 390 c-21 -23 -13 -50 14 -50 23 0 45 34 37 56 -8 20 -30 17 -51 -6z "
+        "m32 -65 c12 -49 -41 -125 -87 -125z",
+        # Implicit linetos after movetos
+        "M1 1 2 2 3 3 m 1 1 2 2 z",
+        # Smooth cubics, including after a non-cubic
+        "M10 10 S 20 20 30 30 s 5 5 10 0 C1 2 3 4 5 6 s1 1 2 2",
+        # Quadratics, smooth quadratics, horizontal/vertical lines
+        "M 0 0 Q 1 1 2 0 T 4 0 t 2 0 t 2 0 L 1 1 Z m 1 1 h 3 v 4 H 0 V 0 z l 2 2",
+        # Arcs (including degenerate and unseparated flags)
+        "M0 0 A 5 3 30 1 0 10 10 a 0 3 0 0 0 1 1 A 1 1 0 0 0 10 10 "
+        "a2 3 45 0 1 5 -5 a1 1 0 01.5 2",
+        # Non-integer coordinates
+        "M0.1 0.2 l0.3 0.7 0.1 0.1 c0.1 0.2 0.3 0.4 0.5 0.6z",
+    ],
+)
+def test_parse_path_data_identical_to_svg_path(d):
+    segments = parse_path_data(d)
+    exp = segments_from_svg_path(parse_path(d.replace("01.5", "0 1.5")))
+    assert np.array_equal(segments.control_points, exp.control_points)
+    assert np.array_equal(segments.arc_indices, exp.arc_indices)
+    assert np.allclose(segments.arcs, exp.arcs)
+
+
+def test_parse_path_data_empty():
+    assert len(parse_path_data("")) == 0
+
+
+def test_parse_path_data_invalid():
+    with pytest.raises(ValueError):
+        parse_path_data("M0 0 L1")
+
+
+class TestSegments(object):
+    def test_slice(self):
+        segments = parse_path_data("M0 0 L1 0 A1 1 0 0 1 3 0 L4 0")
+        assert len(segments) == 4
+        assert segments.start == (0.0, 0.0)
+        assert segments.arc_indices.tolist() == [2]
+        assert segments.polynomial_indices.tolist() == [0, 1, 3]
+
+        tail = segments[1:]
+        assert len(tail) == 3
+        assert tail.start == (0.0, 0.0)
+        assert tail.arc_indices.tolist() == [1]
+        assert np.array_equal(tail.arcs, segments.arcs)
+
+        head = segments[:2]
+        assert head.arc_indices.tolist() == []
+        assert head.arcs.shape == (0, 7)
+
+    def test_only_slicing(self):
+        segments = Segments(np.zeros((2, 4, 2)))
+        with pytest.raises(TypeError):
+            segments[0]
+        with pytest.raises(ValueError):
+            segments[::2]
@@ -0,0 +1,42 @@
+import pytest
+
+from xml.etree import ElementTree
+
+from svgoutline.svg_utils import SVG_NAMESPACE
+from svgoutline.stroke_history import StrokeHistoryWriter
+
+
+@pytest.fixture
+def filename(tmp_path):
+    return str(tmp_path / "history.svg")
+
+
+def test_empty(filename):
+    with StrokeHistoryWriter(filename, 400, 200) as history:
+        assert history.num_strokes == 0
+
+    root = ElementTree.parse(filename).getroot()
+    assert root.tag == f"{{{SVG_NAMESPACE}}}svg"
+    assert root.attrib["viewBox"] == "0,0,400,200"
+    assert list(root) == []
+
+
+def test_strokes_written_once_each(filename):
+    with StrokeHistoryWriter(filename, 400, 200) as history:
+        history.add_stroke((1, 2), [3, 5], [4, 6])
+        history.add_stroke((10, 20), [30], [40])
+        assert history.num_strokes == 2
+
+    root = ElementTree.parse(filename).getroot()
+    groups = root.findall(f"{{{SVG_NAMESPACE}}}g")
+    assert [g.attrib["id"] for g in groups] == ["stroke-0", "stroke-1"]
+
+    paths = [g.find(f"{{{SVG_NAMESPACE}}}path").attrib["d"] for g in groups]
+    assert paths == ["M1 2 L 3,4 L 5,6", "M10 20 L 30,40"]
+
+
+def test_close_is_idempotent(filename):
+    history = StrokeHistoryWriter(filename, 1, 1)
+    history.close()
+    history.close()
+    assert open(filename).read().count("</svg>") == 1
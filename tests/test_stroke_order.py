@@ -0,0 +1,109 @@
+import pytest
+
+import numpy as np
+
+from svgoutline.stroke_order import order_strokes, order_outlines, pen_up_distance
+
+
+def brute_force_greedy(strokes, start, allow_reversal):
+    # Reference greedy nearest-neighbour ordering by exhaustive search
+    position = np.array(start, dtype=float)
+    remaining = list(range(len(strokes)))
+    order = []
+    reversed_ = []
+    while remaining:
+        options = [
+            (np.hypot(*(strokes[k][-1 if r else 0] - position)), k, r)
+            for k in remaining
+            for r in ([False, True] if allow_reversal else [False])
+        ]
+        distance, k, r = min(options)
+        order.append(k)
+        reversed_.append(r)
+        remaining.remove(k)
+        position = strokes[k][0 if r else -1]
+    return order, reversed_
+
+
+def random_strokes(rng, n):
+    return [
+        np.cumsum(rng.normal(size=(rng.integers(1, 5), 2)), axis=0)
+        + rng.uniform(0, 100, 2)
+        for _ in range(n)
+    ]
+
+
+def test_pen_up_distance():
+    strokes = [[(3, 4), (10, 4)], [], [(10, 0)]]
+    assert pen_up_distance(strokes) == pytest.approx(5 + 4)
+    assert pen_up_distance(strokes, start=(3, 4)) == pytest.approx(4)
+    assert pen_up_distance([]) == 0
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("allow_reversal", [False, True])
+def test_greedy_matches_brute_force(seed, allow_reversal):
+    rng = np.random.default_rng(seed)
+    strokes = random_strokes(rng, rng.integers(1, 30))
+    order, reversed_, distance = order_strokes(
+        strokes, start=(5, 5), allow_reversal=allow_reversal
+    )
+    assert (order, reversed_) == brute_force_greedy(strokes, (5, 5), allow_reversal)
+    assert distance == pytest.approx(
+        pen_up_distance(
+            [strokes[i][::-1] if r else strokes[i] for i, r in zip(order, reversed_)],
+            (5, 5),
+        )
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_two_opt_never_worse(seed):
+    rng = np.random.default_rng(seed)
+    strokes = random_strokes(rng, 50)
+    greedy_distance = order_strokes(strokes)[2]
+    order, reversed_, distance = order_strokes(strokes, two_opt=True)
+    assert sorted(order) == list(range(50))
+    assert distance <= greedy_distance + 1e-9
+    assert distance < pen_up_distance(strokes)
+
+
+def test_two_opt_untangles():
+    # Greedy from the origin takes (1, 0) first then must double back
+    strokes = [[(1, 0)], [(-1, 0)], [(2, 0)], [(-2, 0)]]
+    greedy = order_strokes(strokes)[2]
+    refined = order_strokes(strokes, two_opt=True)[2]
+    assert refined < greedy
+
+
+def test_reversal():
+    strokes = [[(10, 0), (1, 0)]]
+    assert order_strokes(strokes, allow_reversal=False)[1:] == ([False], 10)
+    assert order_strokes(strokes)[1:] == ([True], 1)
+
+
+def test_empty_strokes_last():
+    order, reversed_, distance = order_strokes([[], [(1, 1)], []])
+    assert order == [1, 0, 2]
+    assert reversed_ == [False, False, False]
+    assert order_strokes([]) == ([], [], 0.0)
+
+
+def test_two_opt_requires_reversal():
+    with pytest.raises(ValueError):
+        order_strokes([[(0, 0)]], allow_reversal=False, two_opt=True)
+
+
+def test_order_outlines():
+    outlines = [
+        ((0, 0, 0, 1), 0.1, [(50, 0), (60, 0)]),
+        ((1, 0, 0, 1), 0.2, [(20, 0), (10, 0)]),
+        (None, 0.3, [(0, 1), (0, 2)]),
+    ]
+    out, distance = order_outlines(outlines)
+    assert out == [
+        (None, 0.3, [(0, 1), (0, 2)]),
+        ((1, 0, 0, 1), 0.2, [(10, 0), (20, 0)]),
+        ((0, 0, 0, 1), 0.1, [(50, 0), (60, 0)]),
+    ]
+    assert distance == pytest.approx(1 + np.hypot(10, 2) + 30)
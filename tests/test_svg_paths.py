@@ -0,0 +1,59 @@
+import pytest
+
+import io
+
+from svgoutline.svg_paths import iter_paths, get_path_strings, read_paths
+
+SVG = b"""<?xml version="1.0" standalone="no"?>
+<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 20010904//EN"
+ "http://www.w3.org/TR/2001/REC-SVG-20010904/DTD/svg10.dtd">
+<svg xmlns="http://www.w3.org/2000/svg" width="30pt" height="49pt">
+<metadata>Created by potrace</metadata>
+<g transform="translate(0,49) scale(0.1,-0.1)">
+<path d="M1 2 L3 4"/>
+<g>
+<path d="M5 6 L7 8" transform="rotate(90)"/>
+</g>
+</g>
+<path d="M9 10 L11 12"/>
+<path/>
+</svg>
+"""
+
+
+def test_iter_paths():
+    assert list(iter_paths(io.BytesIO(SVG))) == [
+        ("M1 2 L3 4", ("translate(0,49) scale(0.1,-0.1)",)),
+        ("M5 6 L7 8", ("translate(0,49) scale(0.1,-0.1)", "rotate(90)")),
+        ("M9 10 L11 12", ()),
+        ("", ()),
+    ]
+
+
+def test_no_namespace(tmp_path):
+    filename = tmp_path / "plain.svg"
+    filename.write_bytes(b'<svg><g transform="scale(2)"><path d="M0 0"/></g></svg>')
+    assert list(iter_paths(str(filename))) == [("M0 0", ("scale(2)",))]
+
+
+def test_get_path_strings():
+    assert get_path_strings(io.BytesIO(SVG)) == [
+        "M1 2 L3 4",
+        "M5 6 L7 8",
+        "M9 10 L11 12",
+        "",
+    ]
+
+
+def test_lazy():
+    # Paths are produced as the document is parsed, before the end is reached
+    paths = iter_paths(io.BytesIO(SVG.replace(b"</svg>", b"<unclosed>")))
+    assert next(paths)[0] == "M1 2 L3 4"
+    with pytest.raises(Exception):
+        list(paths)
+
+
+def test_read_paths():
+    svg_attrib, paths = read_paths(io.BytesIO(SVG))
+    assert svg_attrib == {"width": "30pt", "height": "49pt"}
+    assert paths == list(iter_paths(io.BytesIO(SVG)))
@@ -0,0 +1,92 @@
+import pytest
+
+import numpy as np
+
+from svgoutline.svg_tokenizer import (
+    parse_numbers,
+    parse_points,
+    tokenize_path,
+    parse_transform,
+)
+
+
+@pytest.mark.parametrize(
+    "text, exp",
+    [
+        ("", []),
+        ("1 2,3", [1, 2, 3]),
+        ("-1-2+3", [-1, -2, 3]),
+        ("1.5.5", [1.5, 0.5]),
+        (".5e2 1E-1", [50, 0.1]),
+    ],
+)
+def test_parse_numbers(text, exp):
+    assert np.array_equal(parse_numbers(text), exp)
+
+
+def test_parse_points():
+    assert np.array_equal(parse_points("1,2 3,4"), [(1, 2), (3, 4)])
+    # Trailing unpaired coordinate ignored
+    assert np.array_equal(parse_points(" 1 2 3 "), [(1, 2)])
+    assert parse_points("").shape == (0, 2)
+
+
+class TestTokenizePath(object):
+    def test_potrace(self):
+        commands, values, offsets = tokenize_path(
+            "M95 390 c-21 -23 -13 -50 14 -50 23 0 45 34 37 56 -8 20 -30 17 -51 -6z"
+            "m1 1h2v3Z"
+        )
+        assert commands.tolist() == ["M", "c", "z", "m", "h", "v", "Z"]
+        assert offsets.tolist() == [0, 2, 20, 20, 22, 23, 24, 24]
+        assert values[:4].tolist() == [95, 390, -21, -23]
+
+    def test_empty(self):
+        commands, values, offsets = tokenize_path("  ")
+        assert len(commands) == 0
+        assert len(values) == 0
+        assert offsets.tolist() == [0]
+
+    def test_unseparated_arc_flags(self):
+        commands, values, offsets = tokenize_path("M0 0 a1 1 0 01.5 2 a1,1,0,1,1,3,4")
+        assert commands.tolist() == ["M", "a", "a"]
+        assert offsets.tolist() == [0, 2, 9, 16]
+        assert values[2:9].tolist() == [1, 1, 0, 0, 1, 0.5, 2]
+
+    @pytest.mark.parametrize(
+        "d",
+        [
+            # Invalid characters
+            "M0 0 X1 1",
+            # Numbers before the first command
+            "1 2 M0 0",
+            # Wrong number of arguments
+            "M0 0 L1",
+            "M0 0 C1 2 3 4",
+            "M0 0 z 1",
+            "M",
+        ],
+    )
+    def test_invalid(self, d):
+        with pytest.raises(ValueError):
+            tokenize_path(d)
+
+
+class TestParseTransform(object):
+    def test_multiple(self):
+        out = parse_transform("translate(0,49) scale(0.1,-0.1)")
+        assert [name for name, args in out] == ["translate", "scale"]
+        assert out[0][1].tolist() == [0, 49]
+        assert out[1][1].tolist() == [0.1, -0.1]
+
+    def test_comma_separated(self):
+        out = parse_transform(" rotate(45 1 2) , skewX(10)")
+        assert [name for name, args in out] == ["rotate", "skewX"]
+
+    def test_empty(self):
+        assert parse_transform("") == []
+
+    @pytest.mark.parametrize("text", ["translate(1", "bogus(1)", "scale(1) x"])
+    def test_invalid(self, text):
+        with pytest.raises(ValueError):
+            parse_transform(text)
@@ -0,0 +1,58 @@
+import pytest
+
+import numpy as np
+
+from svgoutline.transforms import (
+    IDENTITY,
+    transform_matrix,
+    compose_transforms,
+    apply_transform,
+    max_scale,
+)
+
+
+@pytest.mark.parametrize(
+    "transform, point, exp",
+    [
+        ("", (1, 2), (1, 2)),
+        ("translate(3)", (1, 2), (4, 2)),
+        ("translate(3, 4)", (1, 2), (4, 6)),
+        ("scale(2)", (1, 2), (2, 4)),
+        ("scale(2 -1)", (1, 2), (2, -2)),
+        ("rotate(90)", (1, 0), (0, 1)),
+        ("rotate(90 1 1)", (2, 1), (1, 2)),
+        ("skewX(45)", (0, 1), (1, 1)),
+        ("skewY(45)", (1, 0), (1, 1)),
+        ("matrix(1 2 3 4 5 6)", (1, 1), (9, 12)),
+        # The rightmost function is applied first
+        ("translate(0,49) scale(0.1,-0.1)", (10, 20), (1, 47)),
+    ],
+)
+def test_transform_matrix(transform, point, exp):
+    assert np.allclose(apply_transform(transform_matrix(transform), point), exp)
+
+
+@pytest.mark.parametrize("transform", ["translate()", "rotate(1 2)", "matrix(1)"])
+def test_transform_matrix_invalid(transform):
+    with pytest.raises(ValueError):
+        transform_matrix(transform)
+
+
+def test_compose_transforms():
+    # Outermost first
+    matrix = compose_transforms(["translate(0,49)", "scale(0.1,-0.1)"])
+    assert np.allclose(matrix, transform_matrix("translate(0,49) scale(0.1,-0.1)"))
+    assert np.array_equal(compose_transforms([]), IDENTITY)
+
+
+def test_apply_transform_shape():
+    points = np.arange(24, dtype=float).reshape(3, 4, 2)
+    out = apply_transform(transform_matrix("translate(1, 2)"), points)
+    assert out.shape == points.shape
+    assert np.array_equal(out, points + (1, 2))
+
+
+def test_max_scale():
+    assert max_scale(transform_matrix("scale(0.1,-0.3) rotate(30)")) == pytest.approx(
+        0.3
+    )